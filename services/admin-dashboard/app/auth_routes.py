@@ -21,6 +21,14 @@ logger = logging.getLogger(__name__)
 # Create authentication router
 auth_router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Static part of the /auth/health payload
+AUTH_HEALTH_FEATURES = (
+    "email_verification",
+    "session_management",
+    "role_based_access",
+    "security_features"
+)
+
 # ================================
 # AUTHENTICATION ENDPOINTS
 # ================================
@@ -283,12 +291,7 @@ async def auth_health_check():
             "service": "admin-authentication",
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
-            "features": [
-                "email_verification",
-                "session_management", 
-                "role_based_access",
-                "security_features"
-            ]
+            "features": AUTH_HEALTH_FEATURES
         }
         
     except Exception as e:
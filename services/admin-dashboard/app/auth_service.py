@@ -103,7 +103,7 @@ class AuthService:
             )
             
             # Convert to dict for MongoDB
-            user_dict = user_data.dict()
+            user_dict = user_data.model_dump()
             await db.admin_users.insert_one(user_dict)
             
             # Send verification email
@@ -15,7 +15,7 @@ class AdminSettings:
     SERVICE_VERSION: str = "1.0.0"
     SERVICE_PORT: int = int(os.getenv("SERVICE_PORT", 8084))
     ENV: str = os.getenv("ENV", "development")
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")  # ADD THIS LINE
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()  # Normalized once here
     
     # Database Configuration (same as other services)
     MONGODB_URL: str = os.getenv(
@@ -24,6 +24,22 @@ class AdminSettings:
     )
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://:redis123@redis:6379/0")
     
+    # MongoDB connection pool - sized for the per-doctor count fan-out of the
+    # dashboard lists; requests queue at most MONGO_WAIT_QUEUE_TIMEOUT_MS for a socket
+    MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", 50))
+    MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", 10))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 2000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 3000))
+    # Wire compression - zlib ships with Python; zstd/snappy can be listed first once
+    # their driver extras are installed
+    MONGO_COMPRESSORS: str = os.getenv("MONGO_COMPRESSORS", "zlib")
+    MONGO_ZLIB_COMPRESSION_LEVEL: int = int(os.getenv("MONGO_ZLIB_COMPRESSION_LEVEL", 6))
+    
+    # Redis connection pool - session reads hit Redis on every authenticated request;
+    # when all connections are busy callers wait up to REDIS_POOL_TIMEOUT_SECONDS
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", 100))
+    REDIS_POOL_TIMEOUT_SECONDS: float = float(os.getenv("REDIS_POOL_TIMEOUT_SECONDS", 2))
+    
     # External Services URLs
     TIMELINE_SERVICE_URL: str = os.getenv("TIMELINE_SERVICE_URL", "http://timeline-service:8001")
     ANALYTICS_SERVICE_URL: str = os.getenv("ANALYTICS_SERVICE_URL", "http://analytics-service:8002")
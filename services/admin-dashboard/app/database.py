@@ -5,6 +5,7 @@ MongoDB connection for admin authentication system with Cronoscita support
 """
 
 import os
+import asyncio
 import logging
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from typing import List, Dict, Optional, Any
@@ -12,12 +13,14 @@ from datetime import datetime
 from bson import ObjectId
 
 from .models import generate_cronoscita_codice
+from .config import settings
 
 logger = logging.getLogger(__name__)
 
 # Global database client
 mongodb_client: AsyncIOMotorClient = None
 database: AsyncIOMotorDatabase = None
+_connect_lock = asyncio.Lock()  # Serializes lazy connection in get_database
 
 # ================================
 # UTILITY FUNCTIONS
@@ -63,9 +66,20 @@ async def connect_to_mongo():
         
         mongodb_client = AsyncIOMotorClient(
             mongodb_url,
-            serverSelectionTimeoutMS=5000,
+            appname=settings.SERVICE_NAME,  # Attributes this service's ops in server logs/currentOp
+            compressors=settings.MONGO_COMPRESSORS,
+            zlibCompressionLevel=settings.MONGO_ZLIB_COMPRESSION_LEVEL,
+            serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
             connectTimeoutMS=5000,
-            maxPoolSize=10
+            maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+            waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            retryWrites=True
+        )
+        logger.info(
+            f"🏊 MongoDB pool: maxPoolSize={settings.MONGO_MAX_POOL_SIZE}, "
+            f"minPoolSize={settings.MONGO_MIN_POOL_SIZE}, "
+            f"waitQueueTimeoutMS={settings.MONGO_WAIT_QUEUE_TIMEOUT_MS}"
         )
         
         # Get database
@@ -91,12 +105,26 @@ async def close_mongo_connection():
         mongodb_client.close()
         logger.info("🔌 MongoDB connection closed")
 
+async def warm_mongo_pool(connections: int):
+    """Open pooled connections up front by issuing concurrent pings"""
+    if database is None or connections <= 0:
+        return
+    
+    try:
+        await asyncio.gather(*(database.command("ping") for _ in range(connections)))
+        logger.info(f"🔥 MongoDB pool warmed with {connections} connections")
+    except Exception as e:
+        logger.warning(f"⚠️ MongoDB pool warmup failed: {str(e)}")
+
 async def get_database() -> AsyncIOMotorDatabase:
     """Get database instance"""
     global database
     
     if database is None:
-        await connect_to_mongo()
+        # Only the first of concurrent cold-start callers connects; the rest wait for it
+        async with _connect_lock:
+            if database is None:
+                await connect_to_mongo()
     
     return database
 
@@ -162,6 +190,15 @@ async def create_exam_catalog_indexes(db: AsyncIOMotorDatabase):
         await db.exam_mappings.create_index([("cronoscita_id", 1), ("codice_catalogo", 1), ("codoffering_wirgilio", 1)])
         await db.exam_mappings.create_index("cronoscita_id")
         
+        # Covers the analytics service's allowed-codes lookup: equality fields first, then the
+        # only projected field, so the query is answered from the index without fetching documents
+        await db.exam_mappings.create_index([
+            ("is_active", 1),
+            ("visualizza_nel_referto", 1),
+            ("cronoscita_id", 1),
+            ("codoffering_wirgilio", 1)
+        ])
+        
         logger.info("✅ Laboratory exam indexes created")
     except Exception as e:
         logger.error(f"❌ Failed to create laboratory indexes: {e}")
@@ -250,6 +287,9 @@ class MasterCatalogRepository:
 class LaboratorioRepository:
     """Repository for laboratory exam operations - COMPLETE FIXED VERSION"""
     
+    # Fields needed to build the mapping dropdown options
+    CATALOG_OPTION_PROJECTION = {"codice_catalogo": 1, "nome_esame": 1}
+    
     def __init__(self, db: AsyncIOMotorDatabase):
         self.database = db
         self.catalog_collection = db.exam_catalog
@@ -354,7 +394,7 @@ class LaboratorioRepository:
         try:
             cursor = self.catalog_collection.find(
                 {"cronoscita_id": cronoscita_id, "is_enabled": True},
-                {"codice_catalogo": 1, "nome_esame": 1}
+                self.CATALOG_OPTION_PROJECTION
             ).sort("nome_esame", 1)
             
             results = await cursor.to_list(length=None)
@@ -857,6 +897,21 @@ class CronoscitaRepository:
             logger.error(f"❌ Error getting Cronoscita list: {e}")
             return []
     
+    async def get_active_cronoscita_options(self) -> List[Dict[str, Any]]:
+        """Get id/nome of active Cronoscita, filtered server-side on the is_active index"""
+        try:
+            cursor = self.cronoscita_collection.find(
+                {"is_active": {"$ne": False}},
+                {"nome": 1}
+            ).sort("created_at", -1)
+            cronoscita_list = await cursor.to_list(length=None)
+            
+            return serialize_mongo_list(cronoscita_list)
+            
+        except Exception as e:
+            logger.error(f"❌ Error getting active Cronoscita options: {e}")
+            return []
+    
     async def check_cronoscita_exists(self, nome: str) -> bool:
         """Check if Cronoscita with this name already exists"""
         try:
@@ -6,7 +6,7 @@ Clean backend service for 6-digit verification codes with proper Gmail SMTP
 
 import smtplib
 import ssl
-import random
+import secrets
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
@@ -54,7 +54,7 @@ class EmailService:
     
     def generate_verification_code(self) -> str:
         """Generate secure 6-digit verification code"""
-        return f"{random.randint(100000, 999999)}"
+        return f"{secrets.randbelow(1_000_000):06d}"
     
     def _create_email_template(self, nome: str, cognome: str, code: str, purpose: str = "signup") -> tuple:
         """Create clean email template without excessive styling"""
@@ -5,24 +5,31 @@ Professional admin interface with Cronoscita organizational structure
 """
 
 from fastapi import FastAPI, Request, HTTPException, Depends, Query, Body
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, Response, StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime, date
+from functools import lru_cache, wraps
+from contextlib import asynccontextmanager
 import os
+import asyncio
 import logging
+import logging.handlers
+import queue
 import sys
+import time
 import httpx
-from typing import List, Dict, Any, Optional
+import orjson
+from typing import List, Dict, Any, Optional, Tuple
 from bson import ObjectId
 
 # Import authentication components
 from .auth_routes import auth_router
 from .session_manager import session_manager
+from .middleware import RequestTimingMiddleware, SelectiveCORSMiddleware, UnhandledExceptionMiddleware
 from .database import (
-    connect_to_mongo, close_mongo_connection, check_database_health, 
+    connect_to_mongo, close_mongo_connection, check_database_health, warm_mongo_pool,
     get_database, LaboratorioRepository, CronoscitaRepository,
     MasterCatalogRepository, RefertoSectionRepository,
     DoctorRepository, DoctorPhraseRepository
@@ -37,15 +44,25 @@ from .models import (
 )
 from .config import settings
 
-# Configure logging
+# Configure logging - handlers enqueue records; stdout/file writes happen on the
+# listener thread so logging never blocks the event loop
+log_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+log_stream_handler = logging.StreamHandler(sys.stdout)
+log_stream_handler.setFormatter(log_formatter)
+log_file_handler = logging.FileHandler(f"/tmp/{settings.SERVICE_NAME}.log", mode="a")
+log_file_handler.setFormatter(log_formatter)
+
+log_queue = queue.SimpleQueue()
+log_queue_handler = logging.handlers.QueueHandler(log_queue)
+log_queue_handler.setFormatter(logging.Formatter("%(message)s"))  # Listener handlers apply the real format
+log_listener = logging.handlers.QueueListener(
+    log_queue, log_stream_handler, log_file_handler, respect_handler_level=True
+)
 logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL.upper()),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler(f"/tmp/{settings.SERVICE_NAME}.log", mode="a")
-    ]
+    level=getattr(logging, settings.LOG_LEVEL, logging.INFO),
+    handlers=[log_queue_handler]
 )
+log_listener.start()
 logger = logging.getLogger(__name__)
 
 async def get_doctors_from_database(db):
@@ -166,6 +183,217 @@ async def get_doctors_info_from_db(db):
         logger.error(f"Error getting doctors from doctors collection: {str(e)}")
         return {}
 
+class DoctorStatsCache:
+    """Short-lived in-process cache of per-doctor dashboard counts, keyed by Cronoscita filter"""
+    
+    def __init__(self, ttl_seconds: float = 30.0, max_filters: int = 64):
+        self.ttl_seconds = ttl_seconds
+        self.max_filters = max_filters
+        # filter -> doctor_id -> (fetched at, stats); each doctor ages on its own
+        self._entries: Dict[str, Dict[str, Tuple[float, Dict[str, int]]]] = {}
+    
+    def get(self, key: str, doctor_id: str) -> Optional[Tuple[Dict[str, int], float]]:
+        """Return (stats, age in seconds) for a doctor, or None when missing or expired"""
+        doctor_entries = self._entries.get(key)
+        entry = doctor_entries.get(doctor_id) if doctor_entries else None
+        if entry is None:
+            return None
+        
+        age = time.monotonic() - entry[0]
+        if age >= self.ttl_seconds:
+            del doctor_entries[doctor_id]
+            return None
+        return entry[1], age
+    
+    def put(self, key: str, doctor_id: str, stats: Dict[str, int]) -> None:
+        """Store freshly counted stats, dropping expired entries and bounding the filter keys"""
+        now = time.monotonic()
+        if key not in self._entries:
+            self._evict_expired(now)
+            # The filter comes from the query string - never keep more than max_filters
+            while len(self._entries) >= self.max_filters:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = {}
+        self._entries[key][doctor_id] = (now, stats)
+    
+    def _evict_expired(self, now: float) -> None:
+        """Drop expired doctor counts and filters left without any"""
+        for key in list(self._entries):
+            doctor_entries = {
+                doctor_id: entry
+                for doctor_id, entry in self._entries[key].items()
+                if now - entry[0] < self.ttl_seconds
+            }
+            if doctor_entries:
+                self._entries[key] = doctor_entries
+            else:
+                del self._entries[key]
+
+doctor_stats_cache = DoctorStatsCache()
+
+async def count_doctor_stats(db, doctor_id: str, base_patients_query: Dict[str, Any], cronoscita_filter: Optional[str]) -> Dict[str, int]:
+    """Count patients and appointments for one doctor (in one Cronoscita if filtered)"""
+    # Build query for this doctor's patients
+    patients_query = {**base_patients_query, "id_medico": doctor_id}
+    
+    # Count appointments for this doctor's patients
+    appointments_query = {"id_medico": doctor_id}
+    if cronoscita_filter:
+        # Get patient CFs for this Cronoscita
+        patients_cursor = db.patients.find(patients_query, {"cf_paziente": 1})
+        patient_cfs = [p["cf_paziente"] async for p in patients_cursor]
+        if not patient_cfs:
+            # No patients in this Cronoscita = no appointments, skip the counts entirely
+            return {"patients": 0, "total": 0, "completed": 0, "scheduled": 0}
+        appointments_query["cf_paziente"] = {"$in": patient_cfs}
+    
+    # Independent counts - submit concurrently on the Motor pool
+    patients_count, total_appointments, completed_appointments, scheduled_count = await asyncio.gather(
+        db.patients.count_documents(patients_query),
+        db.appointments.count_documents(appointments_query),
+        db.appointments.count_documents({**appointments_query, "status": "completed"}),
+        db.appointments.count_documents({**appointments_query, "status": "scheduled"})
+    )
+    
+    return {
+        "patients": patients_count,
+        "total": total_appointments,
+        "completed": completed_appointments,
+        "scheduled": scheduled_count
+    }
+
+# Resolved once at import - create_application() branches on this constant
+STATIC_DIR = "app/static"
+HAS_STATIC_DIR = os.path.isdir(STATIC_DIR)
+
+def async_ttl_cache(ttl: float):
+    """Cache the result of a no-argument coroutine function for ttl seconds"""
+    def decorator(func):
+        cached: Dict[str, Any] = {"at": float("-inf"), "value": None}
+        
+        @wraps(func)
+        async def wrapper():
+            now = time.monotonic()
+            if now - cached["at"] >= ttl:
+                cached["value"] = await func()
+                cached["at"] = now
+            return cached["value"]
+        
+        return wrapper
+    return decorator
+
+# Constant payloads - serialized once at import
+ROOT_BYTES = orjson.dumps({
+    "service": "admin-dashboard",
+    "status": "running",
+    "version": settings.SERVICE_VERSION,
+    "cronoscita_support": "enabled",
+    "description": "Admin dashboard with Cronoscita organizational structure"
+})
+
+HEALTH_BYTES = orjson.dumps({
+    "service": "admin-dashboard",
+    "status": "healthy",
+    "cronoscita_system": "active"
+})
+
+# Probe endpoints are never called cross-origin from a browser
+CORS_EXEMPT_PATHS = frozenset({"/health", "/ready"})
+
+# Built once and returned as-is - Response renders body and headers in
+# __init__ and only re-sends them per request
+ROOT_RESPONSE = Response(ROOT_BYTES, media_type="application/json")
+HEALTH_RESPONSE = Response(HEALTH_BYTES, media_type="application/json")
+
+READY_CACHE_TTL_SECONDS = 2.0
+READY_DB_TIMEOUT_SECONDS = 3.0
+
+@async_ttl_cache(ttl=READY_CACHE_TTL_SECONDS)
+async def cached_readiness() -> Dict[str, Any]:
+    """Database readiness, bounded by READY_DB_TIMEOUT_SECONDS"""
+    try:
+        db_health = await asyncio.wait_for(check_database_health(), timeout=READY_DB_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.error("Readiness check timed out")
+        db_health = {"status": "unhealthy", "error": "timeout", "connection": "failed"}
+    
+    return {
+        "service": "admin-dashboard",
+        "status": "healthy" if db_health["status"] == "healthy" else "unhealthy",
+        "timestamp": datetime.now(),
+        "database": db_health,
+        "cronoscita_system": "active"
+    }
+
+# ================================
+# DEPENDENCY INJECTION
+# ================================
+
+async def get_cronoscita_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> CronoscitaRepository:
+    """Get Cronoscita repository instance"""
+    return CronoscitaRepository(db)
+
+async def get_laboratorio_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> LaboratorioRepository:
+    """Get laboratory repository instance"""
+    return LaboratorioRepository(db)
+
+async def get_master_catalog_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> MasterCatalogRepository:
+    """Get master catalog repository instance"""
+    return MasterCatalogRepository(db)
+
+async def get_referto_section_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> RefertoSectionRepository:
+    """Get referto section repository instance"""
+    return RefertoSectionRepository(db)
+
+async def get_doctor_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> DoctorRepository:
+    """Get doctor repository instance"""
+    return DoctorRepository(db)
+
+async def get_doctor_phrase_repository(db: AsyncIOMotorDatabase = Depends(get_database)) -> DoctorPhraseRepository:
+    """Get doctor phrase repository instance"""
+    return DoctorPhraseRepository(db)
+
+# ================================
+# APPLICATION LIFESPAN
+# ================================
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown - MongoDB and Redis connect concurrently"""
+    logger.info(f"🚀 Starting {settings.SERVICE_NAME} v{settings.SERVICE_VERSION}")
+    logger.info(f"🌍 Environment: {settings.ENV}")
+    logger.info(f"🔌 Port: {settings.SERVICE_PORT}")
+    
+    mongo_result, redis_result = await asyncio.gather(
+        connect_to_mongo(),
+        session_manager.init_redis(),  # Falls back to in-memory sessions on its own
+        return_exceptions=True
+    )
+    if isinstance(mongo_result, Exception):
+        logger.error(f"❌ Startup failed: {str(mongo_result)}")
+        raise mongo_result
+    logger.info("✅ MongoDB connection established")
+    
+    # Sessions work either way - log the backend actually in use
+    if isinstance(redis_result, Exception):
+        logger.error(f"❌ Redis session manager initialization failed: {str(redis_result)}")
+    if session_manager.redis_client is not None:
+        logger.info("✅ Session manager initialized (backend: Redis)")
+    else:
+        logger.warning("⚠️ Session manager initialized (backend: in-memory, development only)")
+    
+    # Pre-open pooled connections so first requests skip the handshake
+    await warm_mongo_pool(settings.MONGO_MIN_POOL_SIZE)
+    
+    logger.info("🏥 Admin Dashboard with Cronoscita support started successfully!")
+    
+    yield
+    
+    logger.info("🔌 Shutting down Admin Dashboard...")
+    await asyncio.gather(close_mongo_connection(), session_manager.close_redis())
+    logger.info("✅ Admin Dashboard shutdown complete")
+    log_listener.stop()
+
 def create_application() -> FastAPI:
     """Create and configure the FastAPI application"""
     
@@ -175,7 +403,9 @@ def create_application() -> FastAPI:
         description="Dashboard amministrativo con struttura organizzativa Cronoscita",
         version=settings.SERVICE_VERSION,
         docs_url="/docs",
-        redoc_url="/redoc"
+        redoc_url="/redoc",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan
     )
 
     def get_cors_origins():
@@ -207,27 +437,31 @@ def create_application() -> FastAPI:
                 "http://localhost:8080"
             ])
         
-        logger.info(f"🏥 Admin Dashboard CORS Origins: {base_origins}")
-        return base_origins
+        # Explicit, de-duplicated allow-list (VM_HOST=localhost repeats the dev origins)
+        origins = tuple(dict.fromkeys(base_origins))
+        logger.info(f"🏥 Admin Dashboard CORS Origins: {list(origins)}")
+        return origins
 
-    # CORS middleware
+    # Middleware - pure ASGI classes only (never BaseHTTPMiddleware / @app.middleware("http")).
+    # add_middleware wraps outside-in: the last one added runs first, so timing
+    # measures CORS handling too. The catch-all 500 sits innermost so CORS headers
+    # are still added to error responses.
+    app.add_middleware(UnhandledExceptionMiddleware)
     app.add_middleware(
-        CORSMiddleware,
+        SelectiveCORSMiddleware,
+        exempt_paths=CORS_EXEMPT_PATHS,
         allow_origins=get_cors_origins(),
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
         allow_headers=["*"]
     )
+    # Below minimum_size (the constant probe/root payloads) bodies pass through uncompressed
+    app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+    app.add_middleware(RequestTimingMiddleware)
 
     # Mount static files
-    if os.path.exists("app/static"):
-        app.mount("/static", StaticFiles(directory="app/static"), name="static")
-
-    # Setup templates
-    if os.path.exists("app/templates"):
-        templates = Jinja2Templates(directory="app/templates")
-    else:
-        templates = None
+    if HAS_STATIC_DIR:
+        app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
     app.include_router(auth_router)
 
@@ -258,6 +492,28 @@ def create_application() -> FastAPI:
         }
         return pathology_names.get(pathology, pathology.replace("_", " ").title())
 
+    def format_patient_row(patient: Dict[str, Any], doctors_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Format a patient document for the admin panel"""
+        # Get doctor name from dynamic lookup
+        doctor_id = patient.get("id_medico", "")
+        doctor_info = doctors_info.get(doctor_id, {})
+        doctor_name = doctor_info.get("nome_completo", f"Medico {doctor_id}")
+        demographics = patient.get("demographics", {})
+        
+        return {
+            "codice_fiscale": patient.get("cf_paziente", ""),
+            "nome": demographics.get("nome", "N/A"),
+            "cognome": demographics.get("cognome", "N/A"),
+            "data_nascita": demographics.get("data_nascita", "N/A"),
+            "telefono": demographics.get("telefono", "N/A"),
+            "email": demographics.get("email", "N/A"),
+            "patologia": patient.get("patologia", "N/A"),
+            "medico_nome": doctor_name,
+            "data_registrazione": patient.get("enrollment_date", patient.get("created_at", datetime.now())).strftime("%d/%m/%Y") if patient.get("enrollment_date") or patient.get("created_at") else "N/A",
+            "status": "Attivo" if patient.get("status") == "active" else "Inattivo"
+        }
+
+    @lru_cache(maxsize=64)
     def get_appointment_type_display(appointment_type: str) -> str:
         """Get human-readable appointment type"""
         type_names = {
@@ -271,788 +527,711 @@ def create_application() -> FastAPI:
         }
         return type_names.get(appointment_type, appointment_type.replace("_", " ").title())
 
+    def format_visit_rows(visits_data: List[Dict[str, Any]], doctors_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Format appointment documents for the admin panel (hot loop - lookups bound to locals)"""
+        formatted_visits = []
+        append = formatted_visits.append
+        doctor_get = doctors_info.get
+        type_display = get_appointment_type_display
+        default_dt = datetime.now()
+        empty = {}
+        
+        for visit in visits_data:
+            vget = visit.get
+            patient_info = vget("patient_info", empty)
+            pget = patient_info.get
+            dget = pget("demographics", empty).get
+            doctor_info = doctor_get(vget("id_medico", ""), empty)
+            scheduled = vget("scheduled_date", default_dt)
+            
+            append({
+                "appointment_id": str(vget("appointment_id", vget("_id", ""))),
+                "patient_name": f"{dget('nome', 'N/A')} {dget('cognome', '')}".strip(),
+                "patient_cf": vget("cf_paziente", "N/A"),
+                "doctor_name": doctor_info.get("nome_completo", "N/A"),
+                "appointment_type": type_display(vget("appointment_type", "")),
+                "scheduled_date": f"{scheduled.day:02d}/{scheduled.month:02d}/{scheduled.year:04d}",
+                "scheduled_time": f"{scheduled.hour:02d}:{scheduled.minute:02d}",
+                "status": vget("status", "scheduled"),
+                "patologia": pget("patologia", "N/A"),
+                "priority": vget("priority", "normal"),
+                "location": vget("location", "ASL Roma 1")
+            })
+        
+        return formatted_visits
+
     # ================================
     # MAIN DASHBOARD ENDPOINTS
     # ================================
 
-    @app.get("/")
-    async def read_root():
+    # Plain Starlette routes - no parameters to validate, so skip FastAPI's
+    # dependency resolution and serialization layer entirely
+    async def read_root(request: Request) -> Response:
         """Root endpoint"""
-        return {
-            "service": "admin-dashboard", 
-            "status": "running", 
-            "version": settings.SERVICE_VERSION,
-            "cronoscita_support": "enabled",
-            "description": "Admin dashboard with Cronoscita organizational structure"
-        }
+        return ROOT_RESPONSE
 
-    @app.get("/health")
-    async def health_check():
-        """Health check endpoint"""
-        try:
-            db_health = await check_database_health()
-            
-            return {
-                "service": "admin-dashboard",
-                "status": "healthy" if db_health["status"] == "healthy" else "unhealthy", 
-                "timestamp": datetime.now(),
-                "database": db_health,
-                "cronoscita_system": "active"
-            }
-        except Exception as e:
-            logger.error(f"Health check failed: {str(e)}")
-            return {"service": "admin-dashboard", "status": "unhealthy", "error": str(e)}
+    async def health_check(request: Request) -> Response:
+        """Liveness probe - constant payload, no database round-trip"""
+        return HEALTH_RESPONSE
+
+    app.add_route("/", read_root, methods=["GET"])
+    app.add_route("/health", health_check, methods=["GET"])
+
+    @app.get("/ready")
+    async def readiness_check():
+        """Readiness probe - database check, cached for READY_CACHE_TTL_SECONDS"""
+        payload = await cached_readiness()
+        status_code = 200 if payload["status"] == "healthy" else 503
+        return ORJSONResponse(payload, status_code=status_code)
 
     # ================================
     # CRONOSCITA MANAGEMENT ENDPOINTS
     # ================================
 
     @app.get("/dashboard/cronoscita/list")
-    async def get_cronoscita_list():
+    async def get_cronoscita_list(cronoscita_repo: CronoscitaRepository = Depends(get_cronoscita_repository)):
         """Get all Cronoscita with statistics"""
-        try:
-            db = await get_database()
-            cronoscita_repo = CronoscitaRepository(db)
-            
-            cronoscita_list = await cronoscita_repo.get_all_cronoscita()
-            
-            return {
-                "success": True,
-                "total": len(cronoscita_list),
-                "cronoscita": cronoscita_list
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting Cronoscita list: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error retrieving Cronoscita data")
+        cronoscita_list = await cronoscita_repo.get_all_cronoscita()
+        
+        return {
+            "success": True,
+            "total": len(cronoscita_list),
+            "cronoscita": cronoscita_list
+        }
 
     @app.post("/dashboard/cronoscita")
-    async def create_cronoscita(request: CronoscitaCreate):
+    async def create_cronoscita(
+        request: CronoscitaCreate,
+        cronoscita_repo: CronoscitaRepository = Depends(get_cronoscita_repository)
+    ):
         """Create new Cronoscita"""
-        try:
-            db = await get_database()
-            cronoscita_repo = CronoscitaRepository(db)
-            
-            # Check if Cronoscita with this name already exists
-            exists = await cronoscita_repo.check_cronoscita_exists(request.nome)
-            if exists:
-                raise HTTPException(status_code=400, detail=f"Cronoscita '{request.nome}' già esistente")
-            
-            cronoscita_id = await cronoscita_repo.create_cronoscita(request.dict())
-            
-            # Get the created Cronoscita
-            cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(cronoscita_id)
-            
-            logger.info(f"✅ Cronoscita created: {request.nome}")
-            
-            return {
-                "success": True,
-                "message": f"Cronoscita '{request.nome}' creata con successo",
-                "cronoscita": cronoscita_data
-            }
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error creating Cronoscita: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error creating Cronoscita")
+        # Check if Cronoscita with this name already exists
+        exists = await cronoscita_repo.check_cronoscita_exists(request.nome)
+        if exists:
+            raise HTTPException(status_code=400, detail=f"Cronoscita '{request.nome}' già esistente")
+        
+        cronoscita_id = await cronoscita_repo.create_cronoscita(request.model_dump())
+        
+        # Get the created Cronoscita
+        cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(cronoscita_id)
+        
+        logger.info(f"✅ Cronoscita created: {request.nome}")
+        
+        return {
+            "success": True,
+            "message": f"Cronoscita '{request.nome}' creata con successo",
+            "cronoscita": cronoscita_data
+        }
 
     @app.get("/dashboard/cronoscita/{cronoscita_id}")
-    async def get_cronoscita_details(cronoscita_id: str):
+    async def get_cronoscita_details(
+        cronoscita_id: str,
+        cronoscita_repo: CronoscitaRepository = Depends(get_cronoscita_repository)
+    ):
         """Get specific Cronoscita details"""
-        try:
-            db = await get_database()
-            cronoscita_repo = CronoscitaRepository(db)
-            
-            cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(cronoscita_id)
-            
-            if not cronoscita_data:
-                raise HTTPException(status_code=404, detail="Cronoscita not found")
-            
-            return {
-                "success": True,
-                "cronoscita": cronoscita_data
-            }
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error getting Cronoscita details: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error retrieving Cronoscita details")
+        cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(cronoscita_id)
+        
+        if not cronoscita_data:
+            raise HTTPException(status_code=404, detail="Cronoscita not found")
+        
+        return {
+            "success": True,
+            "cronoscita": cronoscita_data
+        }
 
     # ================================
     # CRONOSCITA-SCOPED LABORATORY ENDPOINTS
     # ================================
 
     @app.get("/dashboard/laboratorio/overview/{cronoscita_id}")
-    async def get_laboratorio_overview(cronoscita_id: str):
+    async def get_laboratorio_overview(
+        cronoscita_id: str,
+        cronoscita_repo: CronoscitaRepository = Depends(get_cronoscita_repository),
+        lab_repo: LaboratorioRepository = Depends(get_laboratorio_repository)
+    ):
         """Get laboratory overview for specific Cronoscita"""
-        try:
-            db = await get_database()
-            cronoscita_repo = CronoscitaRepository(db)
-            lab_repo = LaboratorioRepository(db)
-            
-            # Verify Cronoscita exists
-            cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(cronoscita_id)
-            if not cronoscita_data:
-                raise HTTPException(status_code=404, detail="Cronoscita not found")
-            
-            # Get overview stats for this Cronoscita
-            stats = await lab_repo.get_overview_stats(cronoscita_id)
-            
-            return {
-                "success": True,
-                "overview": {
-                    "cronoscita_id": cronoscita_id,
-                    "cronoscita_nome": cronoscita_data["nome"],
-                    **stats
-                }
+        # Verify Cronoscita exists
+        cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(cronoscita_id)
+        if not cronoscita_data:
+            raise HTTPException(status_code=404, detail="Cronoscita not found")
+        
+        # Get overview stats for this Cronoscita
+        stats = await lab_repo.get_overview_stats(cronoscita_id)
+        
+        return {
+            "success": True,
+            "overview": {
+                "cronoscita_id": cronoscita_id,
+                "cronoscita_nome": cronoscita_data["nome"],
+                **stats
             }
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error getting laboratory overview: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error retrieving laboratory overview")
+        }
 
     @app.get("/dashboard/laboratorio/catalogo/{cronoscita_id}")
-    async def get_exam_catalog(cronoscita_id: str):
+    async def get_exam_catalog(
+        cronoscita_id: str,
+        cronoscita_repo: CronoscitaRepository = Depends(get_cronoscita_repository),
+        lab_repo: LaboratorioRepository = Depends(get_laboratorio_repository)
+    ):
         """Get exam catalog for specific Cronoscita"""
-        try:
-            db = await get_database()
-            cronoscita_repo = CronoscitaRepository(db)
-            lab_repo = LaboratorioRepository(db)
-            
-            # Verify Cronoscita exists
-            cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(cronoscita_id)
-            if not cronoscita_data:
-                raise HTTPException(status_code=404, detail="Cronoscita not found")
-            
-            catalog_entries = await lab_repo.get_exam_catalog(cronoscita_id)
-            
-            return {
-                "success": True,
-                "cronoscita_nome": cronoscita_data["nome"],
-                "total": len(catalog_entries),
-                "catalog": catalog_entries
-            }
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error getting exam catalog: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error retrieving exam catalog")
+        # Verify Cronoscita exists
+        cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(cronoscita_id)
+        if not cronoscita_data:
+            raise HTTPException(status_code=404, detail="Cronoscita not found")
+        
+        catalog_entries = await lab_repo.get_exam_catalog(cronoscita_id)
+        
+        return {
+            "success": True,
+            "cronoscita_nome": cronoscita_data["nome"],
+            "total": len(catalog_entries),
+            "catalog": catalog_entries
+        }
 
     @app.get("/dashboard/prestazioni/search")
     async def search_master_prestazioni(
         query: str = Query(..., min_length=2, description="Search term"), 
-        limit: int = Query(20, le=50)
+        limit: int = Query(20, le=50),
+        master_repo: MasterCatalogRepository = Depends(get_master_catalog_repository)
     ):
         """Search master prestazioni catalog"""
-        try:
-            db = await get_database()
-            master_repo = MasterCatalogRepository(db)
-            
-            results = await master_repo.search_prestazioni(query, limit)
-            
-            return {
-                "success": True,
-                "query": query,
-                "total_found": len(results),
-                "prestazioni": results
-            }
-            
-        except Exception as e:
-            logger.error(f"Error searching prestazioni: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error searching prestazioni")
+        results = await master_repo.search_prestazioni(query, limit)
+        
+        return {
+            "success": True,
+            "query": query,
+            "total_found": len(results),
+            "prestazioni": results
+        }
 
 
 
     @app.post("/dashboard/laboratorio/catalogo")  # Keep existing endpoint name
-    async def create_exam_catalog(request: ExamCatalogCreate):
+    async def create_exam_catalog(
+        request: ExamCatalogCreate,
+        cronoscita_repo: CronoscitaRepository = Depends(get_cronoscita_repository),
+        lab_repo: LaboratorioRepository = Depends(get_laboratorio_repository),
+        master_repo: MasterCatalogRepository = Depends(get_master_catalog_repository)
+    ):
         """Create exam catalog with master validation"""
-        try:
-            db = await get_database()
-            cronoscita_repo = CronoscitaRepository(db)
-            lab_repo = LaboratorioRepository(db)
-            master_repo = MasterCatalogRepository(db)  # NEW
-            
-            # Verify Cronoscita exists
-            cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(request.cronoscita_id)
-            if not cronoscita_data:
-                raise HTTPException(status_code=400, detail="Cronoscita non trovata")
-            
-            # VALIDATE AGAINST MASTER CATALOG
-            validation = await master_repo.validate_prestazione({
-                "codice_catalogo": request.codice_catalogo,
-                "codicereg": request.codicereg,
-                "nome_esame": request.nome_esame,
-                "codice_branca": request.codice_branca
-            })
-            
-            if not validation["valid"]:
-                logger.warning(f"❌ Validation failed: {validation['error']}")
-                raise HTTPException(status_code=400, detail=validation["error"])
-            
-            # Add branch description from master
-            exam_data = request.dict()
-            exam_data["branch_description"] = validation["master_data"]["branch_description"]
-            
-            exam_id = await lab_repo.create_exam_catalog(exam_data)
-            
-            logger.info(f"✅ Validated exam added: {request.codice_catalogo} to {cronoscita_data['nome']}")
-            
-            return {
-                "success": True,
-                "message": f"Esame '{request.nome_esame}' aggiunto e validato per {cronoscita_data['nome']}",
-                "exam_id": exam_id,
-                "validated": True
-            }
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error creating validated exam: {str(e)}")
-            raise HTTPException(status_code=500, detail="Errore durante creazione esame")
+        # Verify Cronoscita exists
+        cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(request.cronoscita_id)
+        if not cronoscita_data:
+            raise HTTPException(status_code=400, detail="Cronoscita non trovata")
+        
+        # VALIDATE AGAINST MASTER CATALOG
+        validation = await master_repo.validate_prestazione({
+            "codice_catalogo": request.codice_catalogo,
+            "codicereg": request.codicereg,
+            "nome_esame": request.nome_esame,
+            "codice_branca": request.codice_branca
+        })
+        
+        if not validation["valid"]:
+            logger.warning(f"❌ Validation failed: {validation['error']}")
+            raise HTTPException(status_code=400, detail=validation["error"])
+        
+        # Add branch description from master
+        exam_data = request.model_dump()
+        exam_data["branch_description"] = validation["master_data"]["branch_description"]
+        
+        exam_id = await lab_repo.create_exam_catalog(exam_data)
+        
+        logger.info(f"✅ Validated exam added: {request.codice_catalogo} to {cronoscita_data['nome']}")
+        
+        return {
+            "success": True,
+            "message": f"Esame '{request.nome_esame}' aggiunto e validato per {cronoscita_data['nome']}",
+            "exam_id": exam_id,
+            "validated": True
+        }
     
 
 
     @app.get("/dashboard/laboratorio/mappings/{cronoscita_id}")
-    async def get_exam_mappings(cronoscita_id: str):
+    async def get_exam_mappings(
+        cronoscita_id: str,
+        cronoscita_repo: CronoscitaRepository = Depends(get_cronoscita_repository),
+        lab_repo: LaboratorioRepository = Depends(get_laboratorio_repository)
+    ):
         """Get exam mappings for specific Cronoscita"""
-        try:
-            db = await get_database()
-            cronoscita_repo = CronoscitaRepository(db)
-            lab_repo = LaboratorioRepository(db)
-            
-            # Verify Cronoscita exists
-            cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(cronoscita_id)
-            if not cronoscita_data:
-                raise HTTPException(status_code=404, detail="Cronoscita not found")
-            
-            mappings = await lab_repo.get_exam_mappings(cronoscita_id)
-            
-            return {
-                "success": True,
-                "cronoscita_nome": cronoscita_data["nome"],
-                "total": len(mappings),
-                "mappings": mappings
-            }
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error getting exam mappings: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error retrieving exam mappings")
+        # Verify Cronoscita exists
+        cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(cronoscita_id)
+        if not cronoscita_data:
+            raise HTTPException(status_code=404, detail="Cronoscita not found")
+        
+        mappings = await lab_repo.get_exam_mappings(cronoscita_id)
+        
+        return {
+            "success": True,
+            "cronoscita_nome": cronoscita_data["nome"],
+            "total": len(mappings),
+            "mappings": mappings
+        }
 
     @app.delete("/dashboard/laboratorio/catalogo/{codice_catalogo}")
     async def delete_exam_catalog(
         codice_catalogo: str,
-        cronoscita_id: str = Query(..., description="Cronoscita ID for security")
+        cronoscita_id: str = Query(..., description="Cronoscita ID for security"),
+        cronoscita_repo: CronoscitaRepository = Depends(get_cronoscita_repository),
+        lab_repo: LaboratorioRepository = Depends(get_laboratorio_repository)
     ):
         """Delete exam catalog entry and cascade delete related mappings"""
-        try:
-            db = await get_database()
-            cronoscita_repo = CronoscitaRepository(db)
-            lab_repo = LaboratorioRepository(db)
-            
-            # Verify Cronoscita exists
-            cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(cronoscita_id)
-            if not cronoscita_data:
-                raise HTTPException(status_code=404, detail="Cronoscita not found")
-            
-            # Check if exam exists in this Cronoscita
-            existing_exam = await lab_repo.get_catalog_by_code(codice_catalogo, cronoscita_id)
-            if not existing_exam:
-                raise HTTPException(
-                    status_code=404, 
-                    detail=f"Esame '{codice_catalogo}' non trovato per {cronoscita_data['nome']}"
-                )
-            
-            # Get mappings count before deletion (for response info)
-            mappings = await lab_repo.get_exam_mappings_for_catalog(codice_catalogo, cronoscita_id)
-            mappings_count = len(mappings)
-            
-            # Perform cascade deletion
-            deleted_exam = await lab_repo.delete_exam_catalog_with_mappings(codice_catalogo, cronoscita_id)
-            
-            if not deleted_exam:
-                raise HTTPException(status_code=500, detail="Errore durante eliminazione esame")
-            
-            logger.info(f"✅ Exam deleted: {codice_catalogo} from {cronoscita_data['nome']} with {mappings_count} mappings")
-            
-            return {
-                "success": True,
-                "message": f"Esame '{existing_exam['nome_esame']}' eliminato con successo",
-                "deleted": {
-                    "codice_catalogo": codice_catalogo,
-                    "nome_esame": existing_exam['nome_esame'],
-                    "mappings_deleted": mappings_count,
-                    "cronoscita_nome": cronoscita_data['nome']
-                }
+        # Verify Cronoscita exists
+        cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(cronoscita_id)
+        if not cronoscita_data:
+            raise HTTPException(status_code=404, detail="Cronoscita not found")
+        
+        # Check if exam exists in this Cronoscita
+        existing_exam = await lab_repo.get_catalog_by_code(codice_catalogo, cronoscita_id)
+        if not existing_exam:
+            raise HTTPException(
+                status_code=404, 
+                detail=f"Esame '{codice_catalogo}' non trovato per {cronoscita_data['nome']}"
+            )
+        
+        # Get mappings count before deletion (for response info)
+        mappings = await lab_repo.get_exam_mappings_for_catalog(codice_catalogo, cronoscita_id)
+        mappings_count = len(mappings)
+        
+        # Perform cascade deletion
+        deleted_exam = await lab_repo.delete_exam_catalog_with_mappings(codice_catalogo, cronoscita_id)
+        
+        if not deleted_exam:
+            raise HTTPException(status_code=500, detail="Errore durante eliminazione esame")
+        
+        logger.info(f"✅ Exam deleted: {codice_catalogo} from {cronoscita_data['nome']} with {mappings_count} mappings")
+        
+        return {
+            "success": True,
+            "message": f"Esame '{existing_exam['nome_esame']}' eliminato con successo",
+            "deleted": {
+                "codice_catalogo": codice_catalogo,
+                "nome_esame": existing_exam['nome_esame'],
+                "mappings_deleted": mappings_count,
+                "cronoscita_nome": cronoscita_data['nome']
             }
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error deleting exam catalog: {str(e)}")
-            raise HTTPException(status_code=500, detail="Errore interno durante eliminazione")
+        }
 
     @app.delete("/dashboard/laboratorio/mappings/{mapping_id}")
-    async def delete_exam_mapping(mapping_id: str):
+    async def delete_exam_mapping(
+        mapping_id: str,
+        lab_repo: LaboratorioRepository = Depends(get_laboratorio_repository)
+    ):
         """Delete exam mapping by ID"""
-        try:
-            db = await get_database()
-            lab_repo = LaboratorioRepository(db)
-            
-            # Delete the mapping
-            success = await lab_repo.delete_exam_mapping(mapping_id)
-            
-            if success:
-                logger.info(f"✅ Mapping deleted: {mapping_id}")
-                return {
-                    "success": True,
-                    "message": "Mappatura rimossa con successo"
-                }
-            else:
-                raise HTTPException(status_code=404, detail="Mapping not found")
-                
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error deleting exam mapping: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error deleting exam mapping")
+        # Delete the mapping
+        success = await lab_repo.delete_exam_mapping(mapping_id)
+        
+        if success:
+            logger.info(f"✅ Mapping deleted: {mapping_id}")
+            return {
+                "success": True,
+                "message": "Mappatura rimossa con successo"
+            }
+        else:
+            raise HTTPException(status_code=404, detail="Mapping not found")
 
     @app.post("/dashboard/laboratorio/mappings")
-    async def create_exam_mapping(request: ExamMappingCreate):
+    async def create_exam_mapping(
+        request: ExamMappingCreate,
+        cronoscita_repo: CronoscitaRepository = Depends(get_cronoscita_repository),
+        lab_repo: LaboratorioRepository = Depends(get_laboratorio_repository)
+    ):
         """Create exam mapping for specific Cronoscita with business rule validation"""
-        try:
-            db = await get_database()
-            cronoscita_repo = CronoscitaRepository(db)
-            lab_repo = LaboratorioRepository(db)
-            
-            # Verify Cronoscita exists
-            cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(request.cronoscita_id)
-            if not cronoscita_data:
-                raise HTTPException(status_code=400, detail="Cronoscita not found")
-            
-            # Verify catalog exam exists in this Cronoscita
-            catalog_exists = await lab_repo.get_catalog_by_code(request.codice_catalogo, request.cronoscita_id)
-            if not catalog_exists:
-                raise HTTPException(status_code=400, detail=f"Exam {request.codice_catalogo} not found in Cronoscita catalog")
-            
-            # NEW: Validate business rules
-            validation_result = await lab_repo.validate_mapping_business_rules(
-                request.cronoscita_id,
-                request.struttura_nome,
-                request.codice_catalogo,
-                request.codoffering_wirgilio
+        # Verify Cronoscita exists
+        cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(request.cronoscita_id)
+        if not cronoscita_data:
+            raise HTTPException(status_code=400, detail="Cronoscita not found")
+        
+        # Verify catalog exam exists in this Cronoscita
+        catalog_exists = await lab_repo.get_catalog_by_code(request.codice_catalogo, request.cronoscita_id)
+        if not catalog_exists:
+            raise HTTPException(status_code=400, detail=f"Exam {request.codice_catalogo} not found in Cronoscita catalog")
+        
+        # NEW: Validate business rules
+        validation_result = await lab_repo.validate_mapping_business_rules(
+            request.cronoscita_id,
+            request.struttura_nome,
+            request.codice_catalogo,
+            request.codoffering_wirgilio
+        )
+        
+        if not validation_result["valid"]:
+            error_messages = [error["message"] for error in validation_result["errors"]]
+            raise HTTPException(
+                status_code=409,  # Conflict status code
+                detail={
+                    "error": "Conflitto mappatura",
+                    "details": error_messages,
+                    "validation_errors": validation_result["errors"]
+                }
             )
-            
-            if not validation_result["valid"]:
-                error_messages = [error["message"] for error in validation_result["errors"]]
-                raise HTTPException(
-                    status_code=409,  # Conflict status code
-                    detail={
-                        "error": "Conflitto mappatura",
-                        "details": error_messages,
-                        "validation_errors": validation_result["errors"]
-                    }
-                )
-            
-            # Create mapping with uppercase exam name
-            mapping_data = request.dict()
-            mapping_data["nome_esame_wirgilio"] = mapping_data["nome_esame_wirgilio"].upper()
-            
-            mapping_id = await lab_repo.create_exam_mapping(mapping_data)
-            
-            logger.info(f"✅ Mapping created: {request.codice_catalogo} -> {request.struttura_nome} for Cronoscita {cronoscita_data['nome']}")
-            
-            return {
-                "success": True,
-                "message": f"Mapping creato per {cronoscita_data['nome']}: {catalog_exists['nome_esame'].upper()} -> {request.struttura_nome}",
-                "mapping_id": mapping_id
-            }
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error creating exam mapping: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error creating exam mapping")
+        
+        # Create mapping with uppercase exam name
+        mapping_data = request.model_dump()
+        mapping_data["nome_esame_wirgilio"] = mapping_data["nome_esame_wirgilio"].upper()
+        
+        mapping_id = await lab_repo.create_exam_mapping(mapping_data)
+        
+        logger.info(f"✅ Mapping created: {request.codice_catalogo} -> {request.struttura_nome} for Cronoscita {cronoscita_data['nome']}")
+        
+        return {
+            "success": True,
+            "message": f"Mapping creato per {cronoscita_data['nome']}: {catalog_exists['nome_esame'].upper()} -> {request.struttura_nome}",
+            "mapping_id": mapping_id
+        }
 
 
     @app.put("/dashboard/laboratorio/mappings/{mapping_id}")
-    async def update_exam_mapping(mapping_id: str, request: ExamMappingCreate):
+    async def update_exam_mapping(
+        mapping_id: str,
+        request: ExamMappingCreate,
+        cronoscita_repo: CronoscitaRepository = Depends(get_cronoscita_repository),
+        lab_repo: LaboratorioRepository = Depends(get_laboratorio_repository)
+    ):
         """Update existing exam mapping with business rule validation"""
-        try:
-            db = await get_database()
-            cronoscita_repo = CronoscitaRepository(db)
-            lab_repo = LaboratorioRepository(db)
-            
-            # Verify mapping exists
-            existing_mapping = await lab_repo.get_mapping_by_id(mapping_id)
-            if not existing_mapping:
-                raise HTTPException(status_code=404, detail="Mapping not found")
-            
-            # Verify Cronoscita exists
-            cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(request.cronoscita_id)
-            if not cronoscita_data:
-                raise HTTPException(status_code=400, detail="Cronoscita not found")
-            
-            # Verify catalog exam exists in this Cronoscita
-            catalog_exists = await lab_repo.get_catalog_by_code(request.codice_catalogo, request.cronoscita_id)
-            if not catalog_exists:
-                raise HTTPException(status_code=400, detail=f"Exam {request.codice_catalogo} not found in Cronoscita catalog")
-            
-            # NEW: Validate business rules (excluding current mapping)
-            validation_result = await lab_repo.validate_mapping_business_rules(
-                request.cronoscita_id,
-                request.struttura_nome,
-                request.codice_catalogo,
-                request.codoffering_wirgilio,
-                exclude_mapping_id=mapping_id
-            )
-            
-            if not validation_result["valid"]:
-                error_messages = [error["message"] for error in validation_result["errors"]]
-                raise HTTPException(
-                    status_code=409,  # Conflict status code
-                    detail={
-                        "error": "Conflitto mappatura",
-                        "details": error_messages,
-                        "validation_errors": validation_result["errors"]
-                    }
-                )
-            
-            # Update mapping
-            mapping_data = request.dict()
-            mapping_data["nome_esame_wirgilio"] = mapping_data["nome_esame_wirgilio"].upper()
-            
-            success = await lab_repo.update_exam_mapping(mapping_id, mapping_data)
-            
-            if success:
-                logger.info(f"✅ Mapping updated: {mapping_id} -> {request.struttura_nome} for Cronoscita {cronoscita_data['nome']}")
-                
-                return {
-                    "success": True,
-                    "message": f"Mapping aggiornato per {cronoscita_data['nome']}: {catalog_exists['nome_esame'].upper()} -> {request.struttura_nome}",
-                    "mapping_id": mapping_id
+        # Verify mapping exists
+        existing_mapping = await lab_repo.get_mapping_by_id(mapping_id)
+        if not existing_mapping:
+            raise HTTPException(status_code=404, detail="Mapping not found")
+        
+        # Verify Cronoscita exists
+        cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(request.cronoscita_id)
+        if not cronoscita_data:
+            raise HTTPException(status_code=400, detail="Cronoscita not found")
+        
+        # Verify catalog exam exists in this Cronoscita
+        catalog_exists = await lab_repo.get_catalog_by_code(request.codice_catalogo, request.cronoscita_id)
+        if not catalog_exists:
+            raise HTTPException(status_code=400, detail=f"Exam {request.codice_catalogo} not found in Cronoscita catalog")
+        
+        # NEW: Validate business rules (excluding current mapping)
+        validation_result = await lab_repo.validate_mapping_business_rules(
+            request.cronoscita_id,
+            request.struttura_nome,
+            request.codice_catalogo,
+            request.codoffering_wirgilio,
+            exclude_mapping_id=mapping_id
+        )
+        
+        if not validation_result["valid"]:
+            error_messages = [error["message"] for error in validation_result["errors"]]
+            raise HTTPException(
+                status_code=409,  # Conflict status code
+                detail={
+                    "error": "Conflitto mappatura",
+                    "details": error_messages,
+                    "validation_errors": validation_result["errors"]
                 }
-            else:
-                raise HTTPException(status_code=500, detail="Failed to update mapping")
-                
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error updating exam mapping: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error updating exam mapping")
-
-    @app.get("/dashboard/laboratorio/catalogo-for-mapping/{cronoscita_id}")
-    async def get_catalog_for_mapping(cronoscita_id: str):
-        """Get simplified catalog list for mapping dropdown for specific Cronoscita"""
-        try:
-            db = await get_database()
-            cronoscita_repo = CronoscitaRepository(db)
-            lab_repo = LaboratorioRepository(db)
-            
-            # Verify Cronoscita exists
-            cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(cronoscita_id)
-            if not cronoscita_data:
-                raise HTTPException(status_code=404, detail="Cronoscita not found")
-            
-            catalog_options = await lab_repo.get_catalog_for_mapping(cronoscita_id)
+            )
+        
+        # Update mapping
+        mapping_data = request.model_dump()
+        mapping_data["nome_esame_wirgilio"] = mapping_data["nome_esame_wirgilio"].upper()
+        
+        success = await lab_repo.update_exam_mapping(mapping_id, mapping_data)
+        
+        if success:
+            logger.info(f"✅ Mapping updated: {mapping_id} -> {request.struttura_nome} for Cronoscita {cronoscita_data['nome']}")
             
             return {
                 "success": True,
-                "cronoscita_nome": cronoscita_data["nome"],
-                "options": catalog_options
+                "message": f"Mapping aggiornato per {cronoscita_data['nome']}: {catalog_exists['nome_esame'].upper()} -> {request.struttura_nome}",
+                "mapping_id": mapping_id
             }
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error getting catalog options: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error retrieving catalog options")
+        else:
+            raise HTTPException(status_code=500, detail="Failed to update mapping")
+
+    @app.get("/dashboard/laboratorio/catalogo-for-mapping/{cronoscita_id}")
+    async def get_catalog_for_mapping(
+        cronoscita_id: str,
+        cronoscita_repo: CronoscitaRepository = Depends(get_cronoscita_repository),
+        lab_repo: LaboratorioRepository = Depends(get_laboratorio_repository)
+    ):
+        """Get simplified catalog list for mapping dropdown for specific Cronoscita"""
+        # Verify Cronoscita exists
+        cronoscita_data = await cronoscita_repo.get_cronoscita_by_id(cronoscita_id)
+        if not cronoscita_data:
+            raise HTTPException(status_code=404, detail="Cronoscita not found")
+        
+        catalog_options = await lab_repo.get_catalog_for_mapping(cronoscita_id)
+        
+        return {
+            "success": True,
+            "cronoscita_nome": cronoscita_data["nome"],
+            "options": catalog_options
+        }
 
     # ================================
     # BASIC DATA ENDPOINTS (for other tabs - simplified without pathology filtering)
     # ================================
 
     @app.get("/dashboard/patients/list")
-    async def get_patients_list(cronoscita_filter: Optional[str] = Query(None, description="Filter by Cronoscita pathology")):
+    async def get_patients_list(
+        cronoscita_filter: Optional[str] = Query(None, description="Filter by Cronoscita pathology"),
+        limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit for the full list"),
+        offset: int = Query(0, ge=0),
+        db: AsyncIOMotorDatabase = Depends(get_database)
+    ):
         """Get patients list with optional Cronoscita filtering"""
-        try:
-            db = await get_database()
-            
-            # Build query filter
-            query_filter = {"status": {"$ne": "inactive"}}  # Exclude inactive patients
-            
-            # Add Cronoscita filter if provided
-            if cronoscita_filter:
-                query_filter["patologia"] = cronoscita_filter
-                logger.info(f"🔍 Filtering patients by Cronoscita: {cronoscita_filter}")
-            
-            # Query patients collection directly (microservices pattern)
-            patients_cursor = db.patients.find(query_filter).sort("created_at", -1)
-            patients_data = await patients_cursor.to_list(length=None)
-            
-            # Get doctors info dynamically
-            doctors_info = await get_doctors_info_from_db(db)
-            
-            # Format patient data for admin panel
-            formatted_patients = []
-            for patient in patients_data:
-                # Get doctor name from dynamic lookup
-                doctor_id = patient.get("id_medico", "")
-                doctor_info = doctors_info.get(doctor_id, {})
-                doctor_name = doctor_info.get("nome_completo", f"Medico {doctor_id}")
-                
-                formatted_patients.append({
-                    "codice_fiscale": patient.get("cf_paziente", ""),
-                    "nome": patient.get("demographics", {}).get("nome", "N/A"),
-                    "cognome": patient.get("demographics", {}).get("cognome", "N/A"),
-                    "data_nascita": patient.get("demographics", {}).get("data_nascita", "N/A"),
-                    "telefono": patient.get("demographics", {}).get("telefono", "N/A"),
-                    "email": patient.get("demographics", {}).get("email", "N/A"),
-                    "patologia": patient.get("patologia", "N/A"),
-                    "medico_nome": doctor_name,
-                    "data_registrazione": patient.get("enrollment_date", patient.get("created_at", datetime.now())).strftime("%d/%m/%Y") if patient.get("enrollment_date") or patient.get("created_at") else "N/A",
-                    "status": "Attivo" if patient.get("status") == "active" else "Inattivo"
-                })
-            
-            result = {
-                "success": True,
-                "total": len(formatted_patients),
-                "patients": formatted_patients
-            }
-            
-            if cronoscita_filter:
-                result["cronoscita_filter"] = cronoscita_filter
-                
-            return result
+        # Build query filter
+        query_filter = {"status": {"$ne": "inactive"}}  # Exclude inactive patients
+        
+        # Add Cronoscita filter if provided
+        if cronoscita_filter:
+            query_filter["patologia"] = cronoscita_filter
+            logger.info(f"🔍 Filtering patients by Cronoscita: {cronoscita_filter}")
+        
+        # Query patients collection directly (microservices pattern)
+        patients_cursor = db.patients.find(query_filter).sort("created_at", -1).skip(offset)
+        if limit is not None:
+            patients_cursor = patients_cursor.limit(limit)
+        patients_data, total_count = await asyncio.gather(
+            patients_cursor.to_list(length=limit),
+            db.patients.count_documents(query_filter)
+        )
+        
+        # Get doctors info dynamically
+        doctors_info = await get_doctors_info_from_db(db)
+        
+        # Format patient data for admin panel
+        formatted_patients = [format_patient_row(patient, doctors_info) for patient in patients_data]
+        
+        result = {
+            "success": True,
+            "total": total_count,
+            "returned": len(formatted_patients),
+            "offset": offset,
+            "limit": limit,
+            "patients": formatted_patients
+        }
+        
+        if cronoscita_filter:
+            result["cronoscita_filter"] = cronoscita_filter
             
-        except Exception as e:
-            logger.error(f"Error getting patients list: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error retrieving patients data")
+        return result
+
+    @app.get("/dashboard/patients/list.ndjson")
+    async def export_patients_ndjson(
+        cronoscita_filter: Optional[str] = Query(None, description="Filter by Cronoscita pathology"),
+        db: AsyncIOMotorDatabase = Depends(get_database)
+    ):
+        """Stream the full patients list as NDJSON for bulk export"""
+        query_filter = {"status": {"$ne": "inactive"}}
+        if cronoscita_filter:
+            query_filter["patologia"] = cronoscita_filter
+        
+        doctors_info = await get_doctors_info_from_db(db)
+        patients_cursor = db.patients.find(query_filter).sort("created_at", -1)
+        
+        async def stream_rows():
+            async for patient in patients_cursor:
+                yield orjson.dumps(format_patient_row(patient, doctors_info)) + b"\n"
+        
+        return StreamingResponse(stream_rows(), media_type="application/x-ndjson")
 
     @app.get("/dashboard/doctors/list")
-    async def get_doctors_list(cronoscita_filter: Optional[str] = Query(None, description="Filter by Cronoscita pathology")):
+    async def get_doctors_list(
+        cronoscita_filter: Optional[str] = Query(None, description="Filter by Cronoscita pathology"),
+        limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit for the full list"),
+        offset: int = Query(0, ge=0),
+        db: AsyncIOMotorDatabase = Depends(get_database)
+    ):
         """Get doctors list dynamically from database with optional Cronoscita filtering"""
-        try:
-            db = await get_database()
-            
-            # Get doctors info dynamically
-            doctors_info = await get_doctors_info_from_db(db)
-            
-            if not doctors_info:
-                return {
-                    "success": True,
-                    "total": 0,
-                    "doctors": []
-                }
-            
-            # Build statistics for each doctor
-            doctors_data = []
-            for doctor_id, doctor_info in doctors_info.items():
-                
-                # ✅ NEW: Filter by cronoscita_activity (from doctors collection)
-                if cronoscita_filter:
-                    # Check if doctor has activity in this Cronoscita
-                    has_activity = cronoscita_filter in doctor_info.get("pathologies", [])
-                    if not has_activity:
-                        continue  # Skip doctors without activity in this Cronoscita
-                
-                # Build query for this doctor's patients
-                patients_query = {
-                    "id_medico": doctor_id,
-                    "status": {"$ne": "inactive"}
-                }
-                
-                # Add Cronoscita filter if provided
-                if cronoscita_filter:
-                    patients_query["patologia"] = cronoscita_filter
-                
-                # Count patients for this doctor (in this Cronoscita if filtered)
-                patients_count = await db.patients.count_documents(patients_query)
-                
-                # Count appointments for this doctor's patients
-                appointments_query = {"id_medico": doctor_id}
-                if cronoscita_filter:
-                    # Get patient CFs for this Cronoscita
-                    patients_cursor = db.patients.find(patients_query, {"cf_paziente": 1})
-                    patient_cfs = [p["cf_paziente"] async for p in patients_cursor]
-                    if patient_cfs:
-                        appointments_query["cf_paziente"] = {"$in": patient_cfs}
-                    else:
-                        appointments_query["cf_paziente"] = {"$in": []}  # No patients = no appointments
-                
-                total_appointments = await db.appointments.count_documents(appointments_query)
-                completed_appointments = await db.appointments.count_documents({
-                    **appointments_query,
-                    "status": "completed"
-                })
-                
-                # Calculate completion rate
-                completion_rate = round((completed_appointments / total_appointments * 100) if total_appointments > 0 else 0, 1)
-                
-                doctors_data.append({
-                    "codice_medico": doctor_info["codice_medico"],
-                    "nome_completo": doctor_info["nome_completo"],
-                    "specializzazione": doctor_info["specializzazione"],
-                    "struttura": doctor_info["struttura"],
-                    "pazienti_registrati": patients_count,
-                    "appuntamenti_totali": total_appointments,
-                    "appuntamenti_completati": completed_appointments,
-                    "tasso_completamento": completion_rate,
-                    "visite_programmate": await db.appointments.count_documents({
-                        **appointments_query,
-                        "status": "scheduled"
-                    }),
-                    "ultima_attivita": format_date(datetime.now()),
-                    "status": "Attivo"
-                })
-            
-            result = {
+        # Get doctors info dynamically
+        doctors_info = await get_doctors_info_from_db(db)
+        
+        if not doctors_info:
+            return {
                 "success": True,
-                "total": len(doctors_data),
-                "doctors": doctors_data
+                "total": 0,
+                "returned": 0,
+                "offset": offset,
+                "limit": limit,
+                "doctors": []
             }
+        
+        # ✅ NEW: Filter by cronoscita_activity (from doctors collection)
+        doctors_items = [
+            (doctor_id, doctor_info)
+            for doctor_id, doctor_info in doctors_info.items()
+            if not cronoscita_filter or cronoscita_filter in doctor_info.get("pathologies", [])
+        ]
+        total_count = len(doctors_items)
+        
+        # Build statistics only for the requested page of doctors
+        doctors_data = []
+        now_str = format_date(datetime.now())
+        
+        # Doctor-independent part of the patients query, built once
+        base_patients_query = {"status": {"$ne": "inactive"}}
+        if cronoscita_filter:
+            base_patients_query["patologia"] = cronoscita_filter
+        
+        # Serve counts from the short-lived cache, counting doctors missing or expired;
+        # cache_age_seconds reports the oldest counts in this response
+        cache_key = cronoscita_filter or "*"
+        cache_age = 0.0
+        
+        page_end = offset + limit if limit is not None else None
+        for doctor_id, doctor_info in doctors_items[offset:page_end]:
+            cached = doctor_stats_cache.get(cache_key, doctor_id)
+            if cached is None:
+                stats = await count_doctor_stats(db, doctor_id, base_patients_query, cronoscita_filter)
+                doctor_stats_cache.put(cache_key, doctor_id, stats)
+            else:
+                stats, age = cached
+                cache_age = max(cache_age, age)
+            
+            total_appointments = stats["total"]
+            completed_appointments = stats["completed"]
+            
+            # Calculate completion rate
+            completion_rate = round((completed_appointments / total_appointments * 100) if total_appointments > 0 else 0, 1)
+            
+            doctors_data.append({
+                "codice_medico": doctor_info["codice_medico"],
+                "nome_completo": doctor_info["nome_completo"],
+                "specializzazione": doctor_info["specializzazione"],
+                "struttura": doctor_info["struttura"],
+                "pazienti_registrati": stats["patients"],
+                "appuntamenti_totali": total_appointments,
+                "appuntamenti_completati": completed_appointments,
+                "tasso_completamento": completion_rate,
+                "visite_programmate": stats["scheduled"],
+                "ultima_attivita": now_str,
+                "status": "Attivo"
+            })
+        
+        result = {
+            "success": True,
+            "total": total_count,
+            "returned": len(doctors_data),
+            "offset": offset,
+            "limit": limit,
+            "cache_age_seconds": round(cache_age, 1),
+            "doctors": doctors_data
+        }
+        
+        if cronoscita_filter:
+            result["cronoscita_filter"] = cronoscita_filter
+            logger.info(f"🔍 Filtering doctors by Cronoscita: {cronoscita_filter} - Found {len(doctors_data)} doctors")
             
-            if cronoscita_filter:
-                result["cronoscita_filter"] = cronoscita_filter
-                logger.info(f"🔍 Filtering doctors by Cronoscita: {cronoscita_filter} - Found {len(doctors_data)} doctors")
-                
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error getting doctors list: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error retrieving doctors data")
+        return result
 
 
     @app.get("/api/cronoscita/for-timeline")
-    async def get_cronoscita_for_timeline():
+    async def get_cronoscita_for_timeline(cronoscita_repo: CronoscitaRepository = Depends(get_cronoscita_repository)):
         """Get active Cronoscita list for Timeline service integration"""
-        try:
-            db = await get_database()
-            cronoscita_repo = CronoscitaRepository(db)
-            
-            cronoscita_list = await cronoscita_repo.get_all_cronoscita()
-            
-            # Filter only active ones and format for Timeline
-            # ✅ Login form shows technical name, dashboard shows nome_presentante
-            active_cronoscita = [
-                {
-                    "code": cronoscita["nome"],  # Technical name (used as value and shown in login form)
-                    "display": cronoscita["nome"],  # Same technical name for login form dropdown
-                    "cronoscita_id": cronoscita["id"]
-                }
-                for cronoscita in cronoscita_list if cronoscita.get("is_active", True)
-            ]
-            
-            return {
-                "success": True,
-                "total": len(active_cronoscita),
-                "cronoscita_options": active_cronoscita
+        # Only active ones, filtered in Mongo
+        cronoscita_list = await cronoscita_repo.get_active_cronoscita_options()
+        
+        # Format for Timeline
+        # ✅ Login form shows technical name, dashboard shows nome_presentante
+        active_cronoscita = [
+            {
+                "code": cronoscita["nome"],  # Technical name (used as value and shown in login form)
+                "display": cronoscita["nome"],  # Same technical name for login form dropdown
+                "cronoscita_id": cronoscita["id"]
             }
-            
-        except Exception as e:
-            logger.error(f"Error getting cronoscita for timeline: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error retrieving cronoscita options")
+            for cronoscita in cronoscita_list
+        ]
+        
+        return {
+            "success": True,
+            "total": len(active_cronoscita),
+            "cronoscita_options": active_cronoscita
+        }
     
     @app.get("/dashboard/visits/list")
-    async def get_visits_list(cronoscita_filter: Optional[str] = Query(None, description="Filter by Cronoscita pathology")):
+    async def get_visits_list(
+        cronoscita_filter: Optional[str] = Query(None, description="Filter by Cronoscita pathology"),
+        limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit for the full list"),
+        offset: int = Query(0, ge=0),
+        db: AsyncIOMotorDatabase = Depends(get_database)
+    ):
         """Get visits/appointments list with optional Cronoscita filtering"""
-        try:
-            db = await get_database()
-            
-            # Build aggregation pipeline for visits with patient and doctor info
-            pipeline = [
-                {
-                    "$lookup": {
-                        "from": "patients",
-                        "localField": "cf_paziente", 
-                        "foreignField": "cf_paziente",
-                        "as": "patient_info"
-                    }
-                },
-                {
-                    "$unwind": {
-                        "path": "$patient_info",
-                        "preserveNullAndEmptyArrays": True
-                    }
+        # Join only the patient fields we format, filtering the foreign side
+        # by Cronoscita inside the $lookup so unmatched rows drop before $sort
+        patient_match = {"$expr": {"$eq": ["$cf_paziente", "$$cf"]}}
+        if cronoscita_filter:
+            patient_match["patologia"] = cronoscita_filter
+            logger.info(f"🔍 Filtering visits by Cronoscita: {cronoscita_filter}")
+        
+        pipeline = [
+            {
+                "$lookup": {
+                    "from": "patients",
+                    "let": {"cf": "$cf_paziente"},
+                    "pipeline": [
+                        {"$match": patient_match},
+                        {"$project": {"demographics": 1, "patologia": 1, "cf_paziente": 1}}
+                    ],
+                    "as": "patient_info"
+                }
+            },
+            {
+                "$unwind": {
+                    "path": "$patient_info",
+                    "preserveNullAndEmptyArrays": not cronoscita_filter
                 }
-            ]
-            
-            # Add Cronoscita filter if provided
-            match_stage = {}
-            if cronoscita_filter:
-                match_stage["patient_info.patologia"] = cronoscita_filter
-                logger.info(f"🔍 Filtering visits by Cronoscita: {cronoscita_filter}")
-            
-            if match_stage:
-                pipeline.append({"$match": match_stage})
-            
-            # Sort by scheduled date (most recent first)
-            pipeline.append({
-                "$sort": {"scheduled_date": -1}
-            })
-            
-            # Execute aggregation
-            visits_cursor = db.appointments.aggregate(pipeline)
-            visits_data = await visits_cursor.to_list(length=None)
-            
-            # Format visit data for admin panel
-            formatted_visits = []
-            for visit in visits_data:
-                patient_info = visit.get("patient_info", {})
-                demographics = patient_info.get("demographics", {})
-                doctor_info = HARDCODED_DOCTORS.get(visit.get("id_medico", ""), {})
-                
-                # Format appointment type for display
-                appointment_type = get_appointment_type_display(visit.get("appointment_type", ""))
-                
-                formatted_visits.append({
-                    "appointment_id": str(visit.get("appointment_id", visit.get("_id", ""))),
-                    "patient_name": f"{demographics.get('nome', 'N/A')} {demographics.get('cognome', '')}".strip(),
-                    "patient_cf": visit.get("cf_paziente", "N/A"),
-                    "doctor_name": doctor_info.get("nome_completo", "N/A"),
-                    "appointment_type": appointment_type,
-                    "scheduled_date": visit.get("scheduled_date", datetime.now()).strftime("%d/%m/%Y"),
-                    "scheduled_time": visit.get("scheduled_date", datetime.now()).strftime("%H:%M"),
-                    "status": visit.get("status", "scheduled"),
-                    "patologia": patient_info.get("patologia", "N/A"),
-                    "priority": visit.get("priority", "normal"),
-                    "location": visit.get("location", "ASL Roma 1")
-                })
-            
-            result = {
-                "success": True,
-                "total": len(formatted_visits),
-                "visits": formatted_visits
             }
+        ]
+        
+        # Unfiltered visits keep every appointment, so a plain count suffices
+        if cronoscita_filter:
+            count_coro = db.appointments.aggregate(pipeline + [{"$count": "total"}]).to_list(length=1)
+        else:
+            count_coro = db.appointments.count_documents({})
+        
+        # Sort by scheduled date (most recent first), then page
+        pipeline.extend([
+            {"$sort": {"scheduled_date": -1}},
+            {"$skip": offset}
+        ])
+        if limit is not None:
+            pipeline.append({"$limit": limit})
+        
+        # Execute aggregation
+        visits_cursor = db.appointments.aggregate(pipeline)
+        visits_data, total_count, doctors_info = await asyncio.gather(
+            visits_cursor.to_list(length=limit),
+            count_coro,
+            get_doctors_info_from_db(db)
+        )
+        if cronoscita_filter:
+            total_count = total_count[0]["total"] if total_count else 0
+        
+        # Format visit data for admin panel
+        formatted_visits = format_visit_rows(visits_data, doctors_info)
+        
+        result = {
+            "success": True,
+            "total": total_count,
+            "returned": len(formatted_visits),
+            "offset": offset,
+            "limit": limit,
+            "visits": formatted_visits
+        }
+        
+        if cronoscita_filter:
+            result["cronoscita_filter"] = cronoscita_filter
             
-            if cronoscita_filter:
-                result["cronoscita_filter"] = cronoscita_filter
-                
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error getting visits list: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error retrieving visits data")
+        return result
     
     # ================================
     # REFERTO SECTIONS MANAGEMENT
     # ================================
     
     @app.post("/dashboard/refertazione/sections", response_model=Dict[str, Any])
-    async def create_referto_section(section_data: RefertoSectionCreate):
+    async def create_referto_section(
+        section_data: RefertoSectionCreate,
+        section_repo: RefertoSectionRepository = Depends(get_referto_section_repository)
+    ):
         """Create a new referto section for a Cronoscita"""
         try:
-            db = await get_database()
-            section_repo = RefertoSectionRepository(db)
-            
             # Create section
-            section_id = await section_repo.create_section(section_data.dict())
+            section_id = await section_repo.create_section(section_data.model_dump())
             
             # Get created section
             created_section = await section_repo.get_section_by_id(section_id)
@@ -1067,60 +1246,48 @@ def create_application() -> FastAPI:
         except ValueError as e:
             logger.error(f"Validation error creating referto section: {str(e)}")
             raise HTTPException(status_code=400, detail=str(e))
-        except Exception as e:
-            logger.error(f"Error creating referto section: {str(e)}")
-            raise HTTPException(status_code=500, detail="Errore nella creazione della sezione referto")
     
     @app.get("/dashboard/refertazione/sections/{cronoscita_id}", response_model=Dict[str, Any])
-    async def get_referto_sections_for_cronoscita(cronoscita_id: str):
+    async def get_referto_sections_for_cronoscita(
+        cronoscita_id: str,
+        section_repo: RefertoSectionRepository = Depends(get_referto_section_repository)
+    ):
         """Get all referto sections for a specific Cronoscita"""
-        try:
-            db = await get_database()
-            section_repo = RefertoSectionRepository(db)
-            
-            # Get sections
-            sections = await section_repo.get_sections_by_cronoscita(cronoscita_id)
-            
-            return {
-                "success": True,
-                "cronoscita_id": cronoscita_id,
-                "total_sections": len(sections),
-                "sections": sections
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting referto sections: {str(e)}")
-            raise HTTPException(status_code=500, detail="Errore nel recupero delle sezioni referto")
+        # Get sections
+        sections = await section_repo.get_sections_by_cronoscita(cronoscita_id)
+        
+        return {
+            "success": True,
+            "cronoscita_id": cronoscita_id,
+            "total_sections": len(sections),
+            "sections": sections
+        }
     
     @app.get("/dashboard/refertazione/sections/{cronoscita_id}/active", response_model=Dict[str, Any])
-    async def get_active_referto_sections(cronoscita_id: str):
+    async def get_active_referto_sections(
+        cronoscita_id: str,
+        section_repo: RefertoSectionRepository = Depends(get_referto_section_repository)
+    ):
         """Get only active referto sections for a Cronoscita (for Timeline service)"""
-        try:
-            db = await get_database()
-            section_repo = RefertoSectionRepository(db)
-            
-            # Get active sections
-            sections = await section_repo.get_active_sections_by_cronoscita(cronoscita_id)
-            
-            return {
-                "success": True,
-                "cronoscita_id": cronoscita_id,
-                "sections": sections
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting active referto sections: {str(e)}")
-            raise HTTPException(status_code=500, detail="Errore nel recupero delle sezioni referto attive")
+        # Get active sections
+        sections = await section_repo.get_active_sections_by_cronoscita(cronoscita_id)
+        
+        return {
+            "success": True,
+            "cronoscita_id": cronoscita_id,
+            "sections": sections
+        }
     
     @app.put("/dashboard/refertazione/sections/{section_id}", response_model=Dict[str, Any])
-    async def update_referto_section(section_id: str, section_data: RefertoSectionUpdate):
+    async def update_referto_section(
+        section_id: str,
+        section_data: RefertoSectionUpdate,
+        section_repo: RefertoSectionRepository = Depends(get_referto_section_repository)
+    ):
         """Update a referto section"""
         try:
-            db = await get_database()
-            section_repo = RefertoSectionRepository(db)
-            
             # Update section
-            update_dict = {k: v for k, v in section_data.dict().items() if v is not None}
+            update_dict = section_data.model_dump(exclude_none=True)
             
             if not update_dict:
                 raise HTTPException(status_code=400, detail="Nessun campo da aggiornare")
@@ -1142,192 +1309,134 @@ def create_application() -> FastAPI:
         except ValueError as e:
             logger.error(f"Validation error updating referto section: {str(e)}")
             raise HTTPException(status_code=400, detail=str(e))
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error updating referto section: {str(e)}")
-            raise HTTPException(status_code=500, detail="Errore nell'aggiornamento della sezione referto")
     
     @app.delete("/dashboard/refertazione/sections/{section_id}", response_model=Dict[str, Any])
-    async def delete_referto_section(section_id: str, hard_delete: bool = Query(False)):
+    async def delete_referto_section(
+        section_id: str,
+        hard_delete: bool = Query(False),
+        section_repo: RefertoSectionRepository = Depends(get_referto_section_repository)
+    ):
         """Delete a referto section (soft delete by default, hard delete if specified)"""
-        try:
-            db = await get_database()
-            section_repo = RefertoSectionRepository(db)
-            
-            if hard_delete:
-                success = await section_repo.hard_delete_section(section_id)
-                message = "Sezione referto eliminata permanentemente"
-            else:
-                success = await section_repo.delete_section(section_id)
-                message = "Sezione referto disattivata con successo"
-            
-            if not success:
-                raise HTTPException(status_code=404, detail="Sezione referto non trovata")
-            
-            return {
-                "success": True,
-                "message": message,
-                "section_id": section_id
-            }
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error deleting referto section: {str(e)}")
-            raise HTTPException(status_code=500, detail="Errore nell'eliminazione della sezione referto")
+        if hard_delete:
+            success = await section_repo.hard_delete_section(section_id)
+            message = "Sezione referto eliminata permanentemente"
+        else:
+            success = await section_repo.delete_section(section_id)
+            message = "Sezione referto disattivata con successo"
+        
+        if not success:
+            raise HTTPException(status_code=404, detail="Sezione referto non trovata")
+        
+        return {
+            "success": True,
+            "message": message,
+            "section_id": section_id
+        }
     
     # ================================
     # DOCTOR PHRASES MANAGEMENT
     # ================================
     
     @app.post("/dashboard/frasario/phrases", response_model=Dict[str, Any])
-    async def create_doctor_phrase(phrase_data: DoctorPhraseCreate):
+    async def create_doctor_phrase(
+        phrase_data: DoctorPhraseCreate,
+        phrase_repo: DoctorPhraseRepository = Depends(get_doctor_phrase_repository)
+    ):
         """Create a new phrase for a doctor in a specific Cronoscita"""
-        try:
-            db = await get_database()
-            phrase_repo = DoctorPhraseRepository(db)
-            
-            phrase_id = await phrase_repo.create_phrase(phrase_data.dict())
-            created_phrase = await phrase_repo.get_phrase_by_id(phrase_id)
-            
-            return {
-                "success": True,
-                "message": "Frase aggiunta con successo",
-                "phrase_id": phrase_id,
-                "phrase": created_phrase
-            }
-            
-        except Exception as e:
-            logger.error(f"Error creating phrase: {str(e)}")
-            raise HTTPException(status_code=500, detail="Errore nella creazione della frase")
+        phrase_id = await phrase_repo.create_phrase(phrase_data.model_dump())
+        created_phrase = await phrase_repo.get_phrase_by_id(phrase_id)
+        
+        return {
+            "success": True,
+            "message": "Frase aggiunta con successo",
+            "phrase_id": phrase_id,
+            "phrase": created_phrase
+        }
     
     @app.get("/dashboard/frasario/phrases/{codice_medico}/{cronoscita_id}", response_model=Dict[str, Any])
-    async def get_doctor_phrases(codice_medico: str, cronoscita_id: str):
+    async def get_doctor_phrases(
+        codice_medico: str, cronoscita_id: str,
+        phrase_repo: DoctorPhraseRepository = Depends(get_doctor_phrase_repository)
+    ):
         """Get all phrases for a doctor in a specific Cronoscita"""
-        try:
-            db = await get_database()
-            phrase_repo = DoctorPhraseRepository(db)
-            
-            phrases = await phrase_repo.get_phrases_by_doctor_cronoscita(codice_medico, cronoscita_id)
-            
-            return {
-                "success": True,
-                "codice_medico": codice_medico,
-                "cronoscita_id": cronoscita_id,
-                "total_phrases": len(phrases),
-                "phrases": phrases
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting phrases: {str(e)}")
-            raise HTTPException(status_code=500, detail="Errore nel recupero delle frasi")
+        phrases = await phrase_repo.get_phrases_by_doctor_cronoscita(codice_medico, cronoscita_id)
+        
+        return {
+            "success": True,
+            "codice_medico": codice_medico,
+            "cronoscita_id": cronoscita_id,
+            "total_phrases": len(phrases),
+            "phrases": phrases
+        }
     
     @app.put("/dashboard/frasario/phrases/{phrase_id}", response_model=Dict[str, Any])
-    async def update_doctor_phrase(phrase_id: str, phrase_data: DoctorPhraseUpdate):
+    async def update_doctor_phrase(
+        phrase_id: str, phrase_data: DoctorPhraseUpdate,
+        phrase_repo: DoctorPhraseRepository = Depends(get_doctor_phrase_repository)
+    ):
         """Update a doctor phrase"""
-        try:
-            db = await get_database()
-            phrase_repo = DoctorPhraseRepository(db)
-            
-            update_dict = {k: v for k, v in phrase_data.dict().items() if v is not None}
-            
-            if not update_dict:
-                raise HTTPException(status_code=400, detail="Nessun campo da aggiornare")
-            
-            success = await phrase_repo.update_phrase(phrase_id, update_dict)
-            
-            if not success:
-                raise HTTPException(status_code=404, detail="Frase non trovata")
-            
-            return {
-                "success": True,
-                "message": "Frase aggiornata con successo"
-            }
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error updating phrase: {str(e)}")
-            raise HTTPException(status_code=500, detail="Errore nell'aggiornamento della frase")
+        update_dict = phrase_data.model_dump(exclude_none=True)
+        
+        if not update_dict:
+            raise HTTPException(status_code=400, detail="Nessun campo da aggiornare")
+        
+        success = await phrase_repo.update_phrase(phrase_id, update_dict)
+        
+        if not success:
+            raise HTTPException(status_code=404, detail="Frase non trovata")
+        
+        return {
+            "success": True,
+            "message": "Frase aggiornata con successo"
+        }
     
     @app.delete("/dashboard/frasario/phrases/{phrase_id}", response_model=Dict[str, Any])
-    async def delete_doctor_phrase(phrase_id: str):
+    async def delete_doctor_phrase(
+        phrase_id: str,
+        phrase_repo: DoctorPhraseRepository = Depends(get_doctor_phrase_repository)
+    ):
         """Delete a doctor phrase"""
-        try:
-            db = await get_database()
-            phrase_repo = DoctorPhraseRepository(db)
-            
-            success = await phrase_repo.delete_phrase(phrase_id)
-            
-            if not success:
-                raise HTTPException(status_code=404, detail="Frase non trovata")
-            
-            return {
-                "success": True,
-                "message": "Frase eliminata con successo"
-            }
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error deleting phrase: {str(e)}")
-            raise HTTPException(status_code=500, detail="Errore nell'eliminazione della frase")
+        success = await phrase_repo.delete_phrase(phrase_id)
+        
+        if not success:
+            raise HTTPException(status_code=404, detail="Frase non trovata")
+        
+        return {
+            "success": True,
+            "message": "Frase eliminata con successo"
+        }
     
     @app.get("/dashboard/frasario/doctors/{cronoscita_id}", response_model=Dict[str, Any])
-    async def get_doctors_by_cronoscita(cronoscita_id: str):
+    async def get_doctors_by_cronoscita(
+        cronoscita_id: str,
+        doctor_repo: DoctorRepository = Depends(get_doctor_repository)
+    ):
         """Get all doctors who have worked with a specific Cronoscita"""
-        try:
-            db = await get_database()
-            doctor_repo = DoctorRepository(db)
-            
-            doctors = await doctor_repo.get_doctors_by_cronoscita(cronoscita_id)
-            
-            return {
-                "success": True,
-                "cronoscita_id": cronoscita_id,
-                "total_doctors": len(doctors),
-                "doctors": doctors
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting doctors: {str(e)}")
-            raise HTTPException(status_code=500, detail="Errore nel recupero dei medici")
-    
-    # ================================
-    # APPLICATION STARTUP/SHUTDOWN EVENTS  
-    # ================================
-
-    @app.on_event("startup")
-    async def startup_event():
-        """Application startup - connect to MongoDB"""
-        logger.info(f"🚀 Starting {settings.SERVICE_NAME} v{settings.SERVICE_VERSION}")
-        logger.info(f"🌍 Environment: {settings.ENV}")
-        logger.info(f"🔌 Port: {settings.SERVICE_PORT}")
+        doctors = await doctor_repo.get_doctors_by_cronoscita(cronoscita_id)
         
-        try:
-            # Connect to MongoDB
-            await connect_to_mongo()
-            logger.info("✅ MongoDB connection established")
-            
-            # Initialize Redis session manager
-            await session_manager.init_redis()
-            logger.info("✅ Redis session manager initialized")
-            
-            logger.info("🏥 Admin Dashboard with Cronoscita support started successfully!")
-            
-        except Exception as e:
-            logger.error(f"❌ Startup failed: {str(e)}")
-            raise
-
-    @app.on_event("shutdown") 
-    async def shutdown_event():
-        """Application shutdown - close connections"""
-        logger.info("🔌 Shutting down Admin Dashboard...")
-        await close_mongo_connection()
-        logger.info("✅ Admin Dashboard shutdown complete")
-
+        return {
+            "success": True,
+            "cronoscita_id": cronoscita_id,
+            "total_doctors": len(doctors),
+            "doctors": doctors
+        }
+    
     return app
 
 # Create the FastAPI application
-app = create_application()
\ No newline at end of file
+app = create_application()
+
+if __name__ == "__main__":
+    import uvicorn
+    is_development = settings.ENV == "development"
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=settings.SERVICE_PORT,
+        reload=is_development,
+        workers=1 if is_development else int(os.getenv("WORKERS", "2")),
+        loop="uvloop",
+        http="httptools",
+        log_level=settings.LOG_LEVEL.lower(),
+        access_log=is_development  # Production logs go through the app logger
+    )
@@ -0,0 +1,104 @@
+# services/admin-dashboard/app/middleware.py
+"""
+Admin Dashboard ASGI Middleware
+Pure ASGI classes - no BaseHTTPMiddleware, so no per-request Request/Response
+wrapping or extra task on the dashboard and health routes
+"""
+
+import logging
+import time
+from typing import Iterable
+
+import orjson
+from starlette.middleware.cors import CORSMiddleware
+
+logger = logging.getLogger(__name__)
+
+class RequestTimingMiddleware:
+    """Adds X-Process-Time to HTTP responses and logs slow requests"""
+
+    def __init__(self, app, slow_request_ms: float = 1000.0):
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"x-process-time", f"{elapsed_ms:.1f}ms".encode("latin-1")))
+                message["headers"] = headers
+
+                if elapsed_ms >= self.slow_request_ms:
+                    logger.warning(f"🐢 Slow request: {scope['method']} {scope['path']} took {elapsed_ms:.1f}ms")
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+class UnhandledExceptionMiddleware:
+    """Turns endpoint errors not mapped to an HTTPException into a JSON 500.
+
+    Added before (inside) the CORS middleware, unlike an exception_handler(Exception)
+    which Starlette runs in the outermost ServerErrorMiddleware, so browser clients
+    still get Access-Control-Allow-Origin on the error response.
+    """
+
+    ERROR_BODY = orjson.dumps({"detail": "Internal server error"})
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracking(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_tracking)
+        except Exception as exc:
+            endpoint = getattr(scope.get("endpoint"), "__name__", "-")
+            logger.error(
+                f"Unhandled error on {scope['method']} {scope['path']} (endpoint {endpoint}): {str(exc)}",
+                exc_info=True
+            )
+            if response_started:
+                # Headers are already on the wire - nothing useful left to send
+                raise
+
+            await send({
+                "type": "http.response.start",
+                "status": 500,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(self.ERROR_BODY)).encode("latin-1")),
+                ],
+            })
+            await send({"type": "http.response.body", "body": self.ERROR_BODY})
+
+class SelectiveCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that passes exempt paths (probes) straight through"""
+
+    def __init__(self, app, exempt_paths: Iterable[str] = (), **kwargs):
+        super().__init__(app, **kwargs)
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        await super().__call__(scope, receive, send)
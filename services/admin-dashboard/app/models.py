@@ -4,14 +4,24 @@ Admin Dashboard Authentication Models
 Professional user management for healthcare administrators - Pydantic v2 Compatible
 """
 
-from pydantic import BaseModel, Field, validator, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, field_validator, EmailStr
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from enum import Enum
+from types import MappingProxyType
 import re
 import secrets
 import string
 
+# Validation patterns - compiled once at import
+USERNAME_PATTERN = re.compile(r'^[a-zA-Z0-9_]+$')
+UPPERCASE_PATTERN = re.compile(r'[A-Z]')
+LOWERCASE_PATTERN = re.compile(r'[a-z]')
+DIGIT_PATTERN = re.compile(r'[0-9]')
+SECTION_CODE_PATTERN = re.compile(r'^[A-Z0-9_]+$')
+# Plain spaces only - tabs, newlines and other control characters are rejected
+CRONOSCITA_NOME_PATTERN = re.compile(r'[A-Z0-9 \-._]+')
+
 class UserRole(str, Enum):
     ADMIN = "admin"
     MANAGER = "manager" 
@@ -23,6 +33,31 @@ class UserStatus(str, Enum):
     SUSPENDED = "suspended"      # Temporarily disabled
     DEACTIVATED = "deactivated"  # Permanently disabled
 
+# ================================
+# SHARED VALIDATORS
+# ================================
+
+def validate_company_email(cls, v: str) -> str:
+    """Validate email is from @gesan.it domain"""
+    v = v.lower()
+    if not v.endswith(COMPANY_DOMAIN):
+        raise ValueError('Email deve essere del dominio aziendale @gesan.it')
+    return v
+
+def normalize_upper(cls, v: Optional[str]) -> Optional[str]:
+    """Strip and uppercase a free-text label; None passes through for updates"""
+    if v is not None:
+        return v.strip().upper()
+    return v
+
+def validate_section_code(cls, v: Optional[str]) -> Optional[str]:
+    """Validate section code format; None passes through for updates"""
+    if v is not None:
+        v = v.strip().upper()
+        if not SECTION_CODE_PATTERN.match(v):
+            raise ValueError('Codice può contenere solo lettere maiuscole, numeri e underscore')
+    return v
+
 # ================================
 # REQUEST MODELS
 # ================================
@@ -36,30 +71,27 @@ class SignUpRequest(BaseModel):
     password: str = Field(..., min_length=8, description="Password sicura")
     role: UserRole = Field(default=UserRole.ANALYST, description="Ruolo utente")
     
-    @validator('email')
-    def validate_company_email(cls, v):
-        """Validate email is from @gesan.it domain"""
-        if not v.lower().endswith('@gesan.it'):
-            raise ValueError('Email deve essere del dominio aziendale @gesan.it')
-        return v.lower()
+    _validate_email = field_validator('email')(validate_company_email)
     
-    @validator('username')
+    @field_validator('username')
+    @classmethod
     def validate_username(cls, v):
         """Validate username format"""
-        if not re.match(r'^[a-zA-Z0-9_]+$', v):
+        if not USERNAME_PATTERN.match(v):
             raise ValueError('Username può contenere solo lettere, numeri e underscore')
         return v.lower()
     
-    @validator('password')
+    @field_validator('password')
+    @classmethod
     def validate_password(cls, v):
         """Validate password strength"""
         if len(v) < 8:
             raise ValueError('Password deve essere almeno 8 caratteri')
-        if not re.search(r'[A-Z]', v):
+        if not UPPERCASE_PATTERN.search(v):
             raise ValueError('Password deve contenere almeno una lettera maiuscola')
-        if not re.search(r'[a-z]', v):
+        if not LOWERCASE_PATTERN.search(v):
             raise ValueError('Password deve contenere almeno una lettera minuscola')
-        if not re.search(r'[0-9]', v):
+        if not DIGIT_PATTERN.search(v):
             raise ValueError('Password deve contenere almeno un numero')
         return v
 
@@ -68,32 +100,20 @@ class EmailVerificationRequest(BaseModel):
     email: EmailStr
     verification_code: str = Field(..., min_length=6, max_length=6, pattern=r'^\d{6}$')  # Changed regex to pattern
     
-    @validator('email')
-    def validate_company_email(cls, v):
-        if not v.lower().endswith('@gesan.it'):
-            raise ValueError('Email deve essere del dominio aziendale @gesan.it')
-        return v.lower()
+    _validate_email = field_validator('email')(validate_company_email)
 
 class LoginRequest(BaseModel):
     """Professional admin login request"""
     email: EmailStr
     verification_code: str = Field(..., min_length=6, max_length=6, pattern=r'^\d{6}$')  # Changed regex to pattern
     
-    @validator('email')
-    def validate_company_email(cls, v):
-        if not v.lower().endswith('@gesan.it'):
-            raise ValueError('Email deve essere del dominio aziendale @gesan.it')
-        return v.lower()
+    _validate_email = field_validator('email')(validate_company_email)
 
 class PasswordResetRequest(BaseModel):
     """Password reset request"""
     email: EmailStr
     
-    @validator('email')
-    def validate_company_email(cls, v):
-        if not v.lower().endswith('@gesan.it'):
-            raise ValueError('Email deve essere del dominio aziendale @gesan.it')
-        return v.lower()
+    _validate_email = field_validator('email')(validate_company_email)
 
 # ================================
 # DATA MODELS
@@ -101,6 +121,8 @@ class PasswordResetRequest(BaseModel):
 
 class AdminUser(BaseModel):
     """Admin user data model"""
+    model_config = ConfigDict(use_enum_values=True)
+    
     user_id: str
     nome: str
     cognome: str
@@ -115,9 +137,6 @@ class AdminUser(BaseModel):
     last_login: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
-    
-    class Config:
-        use_enum_values = True
 
 class EmailVerificationCode(BaseModel):
     """Email verification code model"""
@@ -135,6 +154,8 @@ class EmailVerificationCode(BaseModel):
 
 class SignUpResponse(BaseModel):
     """Registration response"""
+    model_config = ConfigDict(frozen=True)
+    
     success: bool
     message: str
     user_id: Optional[str] = None
@@ -143,12 +164,16 @@ class SignUpResponse(BaseModel):
 
 class EmailVerificationResponse(BaseModel):
     """Email verification response"""
+    model_config = ConfigDict(frozen=True)
+    
     success: bool
     message: str
     email_verified: bool = False
 
 class LoginResponse(BaseModel):
     """Login response"""
+    model_config = ConfigDict(frozen=True)
+    
     success: bool
     message: str
     access_token: Optional[str] = None
@@ -157,6 +182,8 @@ class LoginResponse(BaseModel):
 
 class UserProfileResponse(BaseModel):
     """User profile response"""
+    model_config = ConfigDict(frozen=True)
+    
     user_id: str
     nome: str
     cognome: str
@@ -167,11 +194,6 @@ class UserProfileResponse(BaseModel):
     email_verified: bool
     last_login: Optional[datetime] = None
     created_at: datetime
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 # ================================
 # LABORATORY EXAM MODELS
@@ -198,6 +220,8 @@ class PrestazioneSearchRequest(BaseModel):
 
 class ExamCatalogResponse(BaseModel):
     """Response model for exam catalog entry - WITH CRONOSCITA SUPPORT"""
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     codice_catalogo: str
     codicereg: str
@@ -211,11 +235,6 @@ class ExamCatalogResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     mappings_count: int = 0
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class ExamMappingCreate(BaseModel):
@@ -234,6 +253,8 @@ class ExamMappingCreate(BaseModel):
 
 class ExamMappingResponse(BaseModel):
     """Response model for exam mapping - WITH CRONOSCITA SUPPORT"""
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     codice_catalogo: str
     nome_esame_catalogo: str  # From catalog
@@ -245,14 +266,11 @@ class ExamMappingResponse(BaseModel):
     is_active: bool
     created_at: datetime
     updated_at: datetime
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 class LaboratorioOverviewResponse(BaseModel):
     """Overview response for laboratory management - WITH CRONOSCITA SUPPORT"""
+    model_config = ConfigDict(frozen=True)
+    
     cronoscita_id: str
     cronoscita_nome: str
     total_catalog_exams: int
@@ -261,18 +279,14 @@ class LaboratorioOverviewResponse(BaseModel):
     active_mappings: int
     strutture_count: int
     last_updated: datetime
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 class CronoscitaCreate(BaseModel):
     """Request model for creating Cronoscita"""
     nome: str = Field(..., min_length=2, max_length=100, description="Nome Cronoscita (sarà convertito in maiuscolo)")
     nome_presentante: str = Field(..., min_length=2, max_length=150, description="Nome presentante (display name)")
     
-    @validator('nome')
+    @field_validator('nome')
+    @classmethod
     def validate_nome(cls, v):
         """Validate and transform nome to uppercase"""
         if not v or not v.strip():
@@ -281,7 +295,7 @@ class CronoscitaCreate(BaseModel):
         nome_clean = v.strip().upper()
         
         # Check for valid characters (letters, numbers, spaces, common punctuation)
-        if not re.match(r'^[A-Z0-9\s\-\.\_]+$', nome_clean):
+        if not CRONOSCITA_NOME_PATTERN.fullmatch(nome_clean):
             raise ValueError('Nome può contenere solo lettere, numeri, spazi e caratteri - . _')
         
         if len(nome_clean) < 2:
@@ -289,7 +303,8 @@ class CronoscitaCreate(BaseModel):
         
         return nome_clean
     
-    @validator('nome_presentante')
+    @field_validator('nome_presentante')
+    @classmethod
     def validate_nome_presentante(cls, v):
         """Validate and transform nome presentante to uppercase"""
         if not v or not v.strip():
@@ -314,6 +329,8 @@ class MasterPrestazione(BaseModel):
 
 class CronoscitaResponse(BaseModel):
     """Response model for Cronoscita"""
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     nome: str
     nome_presentante: str  # Display name shown to users
@@ -326,17 +343,14 @@ class CronoscitaResponse(BaseModel):
     total_mappings: int = 0
     active_mappings: int = 0
     is_active: bool = True
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+
+CRONOSCITA_CODICE_ALPHABET = string.ascii_uppercase + string.digits
+_system_random = secrets.SystemRandom()
 
 def generate_cronoscita_codice() -> str:
     """Generate a random short code for Cronoscita (e.g., CR-A7B2)"""
-    # Generate 4 random alphanumeric characters
-    random_chars = ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(4))
-    return f"CR-{random_chars}"
+    # 4 random alphanumeric characters drawn in one call from the OS CSPRNG
+    return "CR-" + "".join(_system_random.choices(CRONOSCITA_CODICE_ALPHABET, k=4))
 
 # ================================
 # REFERTO SECTIONS MODELS
@@ -353,18 +367,8 @@ class RefertoSectionCreate(BaseModel):
     is_required: bool = Field(default=False, description="Se la sezione è obbligatoria")
     is_active: bool = Field(default=True, description="Se la sezione è attiva")
     
-    @validator('section_name')
-    def validate_section_name(cls, v):
-        """Validate and normalize section name"""
-        return v.strip().upper()
-    
-    @validator('section_code')
-    def validate_section_code(cls, v):
-        """Validate section code format"""
-        v = v.strip().upper()
-        if not re.match(r'^[A-Z0-9_]+$', v):
-            raise ValueError('Codice può contenere solo lettere maiuscole, numeri e underscore')
-        return v
+    _normalize_section_name = field_validator('section_name')(normalize_upper)
+    _validate_section_code = field_validator('section_code')(validate_section_code)
 
 class RefertoSectionUpdate(BaseModel):
     """Update referto section configuration"""
@@ -375,23 +379,13 @@ class RefertoSectionUpdate(BaseModel):
     is_required: Optional[bool] = None
     is_active: Optional[bool] = None
     
-    @validator('section_name')
-    def validate_section_name(cls, v):
-        if v is not None:
-            return v.strip().upper()
-        return v
-    
-    @validator('section_code')
-    def validate_section_code(cls, v):
-        if v is not None:
-            v = v.strip().upper()
-            if not re.match(r'^[A-Z0-9_]+$', v):
-                raise ValueError('Codice può contenere solo lettere maiuscole, numeri e underscore')
-            return v
-        return v
+    _normalize_section_name = field_validator('section_name')(normalize_upper)
+    _validate_section_code = field_validator('section_code')(validate_section_code)
 
 class RefertoSectionResponse(BaseModel):
     """Response model for referto section"""
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     cronoscita_id: str
     cronoscita_nome: Optional[str] = None
@@ -405,11 +399,6 @@ class RefertoSectionResponse(BaseModel):
     is_active: bool
     created_at: datetime
     updated_at: datetime
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 # ================================
 # DOCTOR MODELS
@@ -435,6 +424,8 @@ class DoctorCreate(BaseModel):
 
 class DoctorResponse(BaseModel):
     """Response model for doctor"""
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     codice_medico: str
     nome_completo: str
@@ -446,11 +437,6 @@ class DoctorResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     last_login: Optional[datetime] = None
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 # ================================
 # DOCTOR PHRASES MODELS
@@ -463,24 +449,19 @@ class DoctorPhraseCreate(BaseModel):
     phrase_text: str = Field(..., min_length=3, max_length=500, description="Testo della frase")
     category: Optional[str] = Field(None, description="Categoria (opzionale)")
     
-    @validator('phrase_text')
-    def validate_phrase(cls, v):
-        """Validate and normalize phrase"""
-        return v.strip().upper()
+    _normalize_phrase = field_validator('phrase_text')(normalize_upper)
 
 class DoctorPhraseUpdate(BaseModel):
     """Update doctor phrase"""
     phrase_text: Optional[str] = Field(None, min_length=3, max_length=500)
     display_order: Optional[int] = None
     
-    @validator('phrase_text')
-    def validate_phrase(cls, v):
-        if v is not None:
-            return v.strip().upper()
-        return v
+    _normalize_phrase = field_validator('phrase_text')(normalize_upper)
 
 class DoctorPhraseResponse(BaseModel):
     """Response model for doctor phrase"""
+    model_config = ConfigDict(frozen=True)
+    
     id: str
     codice_medico: str
     cronoscita_id: str
@@ -492,11 +473,6 @@ class DoctorPhraseResponse(BaseModel):
     last_used: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 # ================================
 # CONSTANTS
@@ -513,9 +489,9 @@ VERIFICATION_CODE_EXPIRY_MINUTES = 15
 ACCOUNT_LOCK_DURATION_MINUTES = 30
 SESSION_EXPIRY_HOURS = 8
 
-# Default roles hierarchy
-ROLE_PERMISSIONS = {
-    UserRole.ADMIN: ["all"],
-    UserRole.MANAGER: ["read", "write", "manage_users"],  
-    UserRole.ANALYST: ["read", "basic_analysis"]
-}
\ No newline at end of file
+# Default roles hierarchy - read-only lookup table
+ROLE_PERMISSIONS = MappingProxyType({
+    UserRole.ADMIN: ("all",),
+    UserRole.MANAGER: ("read", "write", "manage_users"),
+    UserRole.ANALYST: ("read", "basic_analysis")
+})
\ No newline at end of file
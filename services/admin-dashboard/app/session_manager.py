@@ -5,13 +5,15 @@ Redis-based session management for admin users
 """
 
 import redis.asyncio as redis
-import json
+import orjson
 import secrets
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import logging
 import os
 
+from .config import settings
+
 logger = logging.getLogger(__name__)
 
 class AdminSessionManager:
@@ -19,46 +21,29 @@ class AdminSessionManager:
     
     def __init__(self):
         self.redis_client = None
+        self.redis_pool = None
+        self._memory_sessions: Dict[str, Dict[str, Any]] = {}  # Fallback store when Redis is down
         self.session_expiry_hours = 8
         self.session_prefix = "admin_session:"
+        self.user_sessions_prefix = "admin_user_sessions:"  # Set of a user's session tokens
         
     async def init_redis(self):
         """Initialize Redis connection"""
         try:
             redis_url = os.getenv("REDIS_URL", "redis://:redis123@redis:6379/0")
             
-            # Parse Redis URL for connection
-            if redis_url.startswith("redis://"):
-                # Extract password and connection details
-                if "@" in redis_url:
-                    auth_part, host_part = redis_url.split("@")
-                    password = auth_part.split(":")[-1]
-                    host_port = host_part.split("/")[0]
-                    host, port = host_port.split(":")
-                    db = int(host_part.split("/")[1]) if "/" in host_part else 0
-                else:
-                    # No password
-                    url_parts = redis_url.replace("redis://", "").split("/")
-                    host_port = url_parts[0]
-                    host, port = host_port.split(":")
-                    password = None
-                    db = int(url_parts[1]) if len(url_parts) > 1 else 0
-            else:
-                # Default values
-                host = "redis"
-                port = 6379
-                password = "redis123"
-                db = 0
-            
-            self.redis_client = redis.Redis(
-                host=host,
-                port=int(port),
-                db=db,
-                password=password,
+            # redis-py parses credentials, host, port and db from the URL.
+            # A blocking pool queues callers briefly instead of failing when exhausted.
+            self.redis_pool = redis.BlockingConnectionPool.from_url(
+                redis_url,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
                 decode_responses=True,
                 socket_timeout=5,
-                socket_connect_timeout=5
+                socket_connect_timeout=5,
+                health_check_interval=30
             )
+            self.redis_client = redis.Redis(connection_pool=self.redis_pool)
             
             # Test connection
             await self.redis_client.ping()
@@ -67,7 +52,16 @@ class AdminSessionManager:
         except Exception as e:
             logger.error(f"❌ Redis connection failed: {str(e)}")
             logger.warning("⚠️ Sessions will be stored in memory (development only)")
+            await self.close_redis()
+    
+    async def close_redis(self):
+        """Close the Redis client and disconnect every pooled connection"""
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
             self.redis_client = None
+        if self.redis_pool is not None:
+            await self.redis_pool.disconnect()
+            self.redis_pool = None
     
     def _generate_session_token(self) -> str:
         """Generate secure session token"""
@@ -78,6 +72,7 @@ class AdminSessionManager:
         try:
             session_token = self._generate_session_token()
             session_key = f"{self.session_prefix}{session_token}"
+            now = datetime.now()
             
             # Prepare session data
             session_data = {
@@ -87,26 +82,26 @@ class AdminSessionManager:
                 "cognome": user_data.get("cognome"),
                 "role": user_data.get("role"),
                 "username": user_data.get("username"),
-                "created_at": datetime.now().isoformat(),
-                "last_accessed": datetime.now().isoformat()
+                "created_at": now.isoformat()
             }
             
             if self.redis_client:
-                # Store in Redis with expiration
+                # Store in Redis with expiration and index the token under its user;
+                # the index expires with the user's most recently used session
+                # (stale tokens are pruned by cleanup_expired_sessions)
                 expiry_seconds = self.session_expiry_hours * 3600
-                await self.redis_client.setex(
-                    session_key,
-                    expiry_seconds,
-                    json.dumps(session_data)
-                )
+                index_key = f"{self.user_sessions_prefix}{user_id}"
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.setex(session_key, expiry_seconds, orjson.dumps(session_data))
+                pipe.sadd(index_key, session_token)
+                pipe.expire(index_key, expiry_seconds)
+                await pipe.execute()
                 logger.info(f"✅ Session created: {user_data.get('email')} - Token: {session_token[:8]}...")
             else:
                 # Fallback: store in memory (development only)
-                if not hasattr(self, '_memory_sessions'):
-                    self._memory_sessions = {}
                 self._memory_sessions[session_token] = {
                     **session_data,
-                    "expires_at": (datetime.now() + timedelta(hours=self.session_expiry_hours)).isoformat()
+                    "expires_at": (now + timedelta(hours=self.session_expiry_hours)).isoformat()
                 }
                 logger.warning(f"⚠️ Session stored in memory: {user_data.get('email')}")
             
@@ -122,34 +117,31 @@ class AdminSessionManager:
             session_key = f"{self.session_prefix}{session_token}"
             
             if self.redis_client:
-                # Get from Redis
-                session_data_json = await self.redis_client.get(session_key)
+                # Read and slide the expiry in one round-trip; the stored value is
+                # never rewritten
+                expiry_seconds = self.session_expiry_hours * 3600
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.get(session_key)
+                pipe.expire(session_key, expiry_seconds)
+                session_data_json, _ = await pipe.execute()
                 if session_data_json:
-                    session_data = json.loads(session_data_json)
-                    
-                    # Update last accessed time
-                    session_data["last_accessed"] = datetime.now().isoformat()
-                    expiry_seconds = self.session_expiry_hours * 3600
-                    await self.redis_client.setex(
-                        session_key,
-                        expiry_seconds,
-                        json.dumps(session_data)
+                    session_data = orjson.loads(session_data_json)
+                    # Keep the user's token index alive as long as this session
+                    await self.redis_client.expire(
+                        f"{self.user_sessions_prefix}{session_data.get('user_id')}",
+                        expiry_seconds
                     )
-                    
                     return session_data
             else:
                 # Get from memory (development only)
-                if hasattr(self, '_memory_sessions') and session_token in self._memory_sessions:
-                    session_data = self._memory_sessions[session_token]
-                    
+                session_data = self._memory_sessions.get(session_token)
+                if session_data is not None:
                     # Check if expired
                     expires_at = datetime.fromisoformat(session_data["expires_at"])
                     if datetime.now() > expires_at:
                         del self._memory_sessions[session_token]
                         return None
                     
-                    # Update last accessed
-                    session_data["last_accessed"] = datetime.now().isoformat()
                     return session_data
             
             return None
@@ -164,13 +156,19 @@ class AdminSessionManager:
             session_key = f"{self.session_prefix}{session_token}"
             
             if self.redis_client:
-                # Delete from Redis
-                result = await self.redis_client.delete(session_key)
-                return result > 0
+                # Delete from Redis and drop the token from its user's index
+                session_data_json = await self.redis_client.get(session_key)
+                if not session_data_json:
+                    return False
+                user_id = orjson.loads(session_data_json).get("user_id")
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.delete(session_key)
+                pipe.srem(f"{self.user_sessions_prefix}{user_id}", session_token)
+                deleted, _ = await pipe.execute()
+                return deleted > 0
             else:
                 # Delete from memory
-                if hasattr(self, '_memory_sessions') and session_token in self._memory_sessions:
-                    del self._memory_sessions[session_token]
+                if self._memory_sessions.pop(session_token, None) is not None:
                     return True
             
             return False
@@ -179,10 +177,45 @@ class AdminSessionManager:
             logger.error(f"❌ Session deletion failed: {str(e)}")
             return False
     
+    async def _prune_user_index(self, index_key: str, tokens: list) -> list:
+        """Remove tokens whose session key has expired from a user index.
+
+        Returns (token, session JSON) pairs for the sessions still alive.
+        """
+        if not tokens:
+            return []
+        
+        session_values = await self.redis_client.mget(
+            [f"{self.session_prefix}{token}" for token in tokens]
+        )
+        live_sessions = []
+        expired_tokens = []
+        for token, session_data_json in zip(tokens, session_values):
+            if session_data_json:
+                live_sessions.append((token, session_data_json))
+            else:
+                expired_tokens.append(token)
+        
+        if expired_tokens:
+            await self.redis_client.srem(index_key, *expired_tokens)
+        
+        return live_sessions
+    
     async def cleanup_expired_sessions(self):
-        """Cleanup expired sessions (mainly for memory storage)"""
+        """Cleanup expired sessions: memory entries, or stale tokens in the Redis user indexes"""
         try:
-            if not self.redis_client and hasattr(self, '_memory_sessions'):
+            if self.redis_client:
+                pruned_indexes = 0
+                async for index_key in self.redis_client.scan_iter(
+                    match=f"{self.user_sessions_prefix}*", count=100
+                ):
+                    tokens = list(await self.redis_client.smembers(index_key))
+                    if len(await self._prune_user_index(index_key, tokens)) < len(tokens):
+                        pruned_indexes += 1
+                
+                if pruned_indexes:
+                    logger.info(f"🧹 Pruned expired tokens from {pruned_indexes} user session indexes")
+            else:
                 now = datetime.now()
                 expired_tokens = []
                 
@@ -204,33 +237,28 @@ class AdminSessionManager:
         """Get all sessions for a user (for admin purposes)"""
         try:
             if self.redis_client:
-                # Scan for user sessions in Redis
-                pattern = f"{self.session_prefix}*"
-                sessions = []
+                # Read the user's token index, then all of its sessions in one MGET
+                index_key = f"{self.user_sessions_prefix}{user_id}"
+                tokens = list(await self.redis_client.smembers(index_key))
                 
-                async for key in self.redis_client.scan_iter(match=pattern):
-                    session_data_json = await self.redis_client.get(key)
-                    if session_data_json:
-                        session_data = json.loads(session_data_json)
-                        if session_data.get("user_id") == user_id:
-                            sessions.append({
-                                "token": key.replace(self.session_prefix, ""),
-                                "created_at": session_data.get("created_at"),
-                                "last_accessed": session_data.get("last_accessed")
-                            })
+                sessions = []
+                for token, session_data_json in await self._prune_user_index(index_key, tokens):
+                    session_data = orjson.loads(session_data_json)
+                    sessions.append({
+                        "token": token,
+                        "created_at": session_data.get("created_at")
+                    })
                 
                 return sessions
             else:
                 # Get from memory
                 sessions = []
-                if hasattr(self, '_memory_sessions'):
-                    for token, session_data in self._memory_sessions.items():
-                        if session_data.get("user_id") == user_id:
-                            sessions.append({
-                                "token": token,
-                                "created_at": session_data.get("created_at"),
-                                "last_accessed": session_data.get("last_accessed")
-                            })
+                for token, session_data in self._memory_sessions.items():
+                    if session_data.get("user_id") == user_id:
+                        sessions.append({
+                            "token": token,
+                            "created_at": session_data.get("created_at")
+                        })
                 return sessions
                 
         except Exception as e:
@@ -11,53 +11,74 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Exact-type checks for the serializer walk - a set lookup or identity test
+# instead of re-running the isinstance chain for every key
+_PASSTHROUGH_TYPES = frozenset({str, int, float, bool, type(None)})
+
+def _serialize_value(value: Any, stack: List) -> Any:
+    """Serialize a scalar, or return an empty container queued on stack for filling"""
+    if isinstance(value, dict):
+        container = {}
+    elif isinstance(value, list):
+        container = []
+    elif isinstance(value, ObjectId):
+        return str(value)
+    elif isinstance(value, datetime):
+        return value.isoformat()
+    else:
+        return value
+    stack.append((value, container))
+    return container
+
 def serialize_mongo_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
     """
     Convert MongoDB document to JSON-serializable format
-    Recursively handles ObjectId and datetime objects
+    Handles ObjectId and datetime objects at any depth, iteratively (no recursion)
     """
     if doc is None:
         return None
     
-    if isinstance(doc, list):
-        return [serialize_mongo_doc(item) for item in doc]
-    
-    if not isinstance(doc, dict):
-        if isinstance(doc, ObjectId):
-            return str(doc)
-        elif isinstance(doc, datetime):
-            return doc.isoformat()
-        else:
-            return doc
+    passthrough = _PASSTHROUGH_TYPES
+    object_id = ObjectId
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    result = _serialize_value(doc, stack)
     
-    serialized_doc = {}
-    for key, value in doc.items():
-        if key == "_id" and isinstance(value, ObjectId):
-            # Convert _id to id
-            serialized_doc["id"] = str(value)
-        elif isinstance(value, ObjectId):
-            # Convert any ObjectId to string
-            serialized_doc[key] = str(value)
-        elif isinstance(value, datetime):
-            # Convert datetime to ISO string
-            serialized_doc[key] = value.isoformat()
-        elif isinstance(value, dict):
-            # Recursively handle nested documents
-            serialized_doc[key] = serialize_mongo_doc(value)
-        elif isinstance(value, list):
-            # Handle arrays
-            serialized_doc[key] = serialize_mongo_doc(value)
+    while stack:
+        source, target = pop()
+        if type(target) is dict:
+            for key, value in source.items():
+                value_type = type(value)
+                if value_type in passthrough:
+                    target[key] = value
+                elif value_type is object_id:
+                    # Convert _id to id
+                    target["id" if key == "_id" else key] = str(value)
+                elif value_type is datetime:
+                    target[key] = value.isoformat()
+                elif value_type is dict:
+                    child = target[key] = {}
+                    push((value, child))
+                elif value_type is list:
+                    child = target[key] = []
+                    push((value, child))
+                elif key == "_id" and isinstance(value, object_id):
+                    target["id"] = str(value)
+                else:
+                    target[key] = _serialize_value(value, stack)
         else:
-            # Keep as is
-            serialized_doc[key] = value
+            append = target.append
+            for value in source:
+                append(value if type(value) in passthrough else _serialize_value(value, stack))
     
-    return serialized_doc
+    return result
 
 def serialize_mongo_list(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    Serialize a list of MongoDB documents
+    Serialize a list of MongoDB documents in a single walk
     """
-    return [serialize_mongo_doc(doc) for doc in docs]
+    return serialize_mongo_doc(list(docs))
 
 class MongoJSONEncoder:
     """
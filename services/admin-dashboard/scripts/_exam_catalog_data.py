@@ -0,0 +1,42 @@
+# services/admin-dashboard/scripts/_exam_catalog_data.py
+"""
+Laboratory exam catalog data shared by the seeders
+(codice_catalogo, codicereg, nome_esame) rows - a constant tuple, built once at compile time
+"""
+
+from typing import Tuple
+
+# LABORATORY EXAMS ONLY - BRANCH 011 (Branca Laboratorio d'Analisi)
+LABORATORY_EXAM_CATALOG: Tuple[Tuple[str, str, str], ...] = (
+    ("90271.003", "90.27.1", "GLUCOSIO [Siero-Plasma]"),
+    ("90441.002", "90.44.1", "UREA [Plasma-Siero]"),
+    ("90163.002", "90.16.3", "CREATININA [Siero]"),
+    ("90435.001", "90.43.5", "URATO [Siero]"),
+    ("90143.001", "90.14.3", "COLESTEROLO TOTALE"),
+    ("90432.001", "90.43.2", "TRIGLICERIDI"),
+    ("90141.001", "90.14.1", "COLESTEROLO HDL"),
+    ("90281.001", "90.28.1", "Hb - EMOGLOBINA GLICATA"),
+    ("90164.001", "90.16.4", "CREATININA CLEARANCE. Non associabile a CREATININA (90.16.3)"),
+    ("90092.001", "90.09.2", "ASPARTATO AMINOTRANSFERASI (AST) (GOT)"),
+    ("90045.001", "90.04.5", "ALANINA AMINOTRANSFERASI (ALT) (GPT)"),
+    ("90154.001", "90.15.4", "CREATINA CHINASI (CPK o CK)"),
+    ("90443.001", "90.44.3", "URINE ESAME COMPLETO. Incluso: sedimento urinario"),
+    ("90051.001", "90.05.1", "ALBUMINA [Siero]"),
+    ("90051.003", "90.05.1", "ALBUMINA [Urine]"),
+    ("90105.001", "90.10.5", "BILIRUBINA REFLEX (cut-off >1 mg-dL salvo definizione di cut-off più restrittivi a livello regionale"),
+    ("9013B.001", "90.13.B", "COLESTEROLO LDL. Determinazione indiretta. Erogabile solo in associazione a Colesterolo HDL (90.14.1"),
+    ("90163.001", "90.16.3", "CREATININA [Liquido Amniotico]"),
+    ("90163.003", "90.16.3", "CREATININA [Urine 24h]"),
+    ("90163.004", "90.16.3", "CREATININA [Urine]"),
+    ("90622.001", "90.62.2", "EMOCROMO: ESAME EMOCROMOCITOMETRICO E CONTEGGIO LEUCOCITARIO DIFFERENZIALE Hb, GR, GB, HCT, PLT, IND"),
+    ("90271.001", "90.27.1", "GLUCOSIO [Liquido Amniotico]"),
+    ("90271.004", "90.27.1", "GLUCOSIO [Urine 24h]"),
+    ("90271.005", "90.27.1", "GLUCOSIO [Urine]"),
+    ("90255.001", "90.25.5", "Gamma GT"),
+    ("90255.003", "90.25.5", "Gamma GT [Siero]"),
+    ("90334.001", "90.33.4", "ALBUMINURIA [MICROALBUMINURIA]"),
+    ("91491.001", "91.49.1", "PRELIEVO DI SANGUE CAPILLARE"),
+    ("91492.001", "91.49.2", "PRELIEVO DI SANGUE VENOSO"),
+    ("90435.003", "90.43.5", "URATO [Urine]"),
+    ("90441.004", "90.44.1", "UREA [Urine]"),
+)
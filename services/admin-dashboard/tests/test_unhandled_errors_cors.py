@@ -0,0 +1,31 @@
+# services/admin-dashboard/tests/test_unhandled_errors_cors.py
+"""
+Unhandled endpoint errors must still carry CORS headers, otherwise the browser
+hides the 500 from the admin frontend as a network error
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_application
+
+ADMIN_ORIGIN = "http://localhost:3012"
+
+@pytest.fixture
+def client():
+    """Fresh application with a raising route - the module-level app is left untouched"""
+    app = create_application()
+    
+    @app.get("/boom")
+    async def raising_endpoint():
+        raise RuntimeError("boom")
+    
+    # No context manager: the lifespan (MongoDB/Redis) is not needed here
+    return TestClient(app, raise_server_exceptions=False)
+
+def test_cross_origin_request_that_raises_gets_cors_headers(client):
+    response = client.get("/boom", headers={"Origin": ADMIN_ORIGIN})
+    
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal server error"}
+    assert response.headers["access-control-allow-origin"] == ADMIN_ORIGIN
@@ -5,7 +5,7 @@ Wirgilio API integration configuration - UPDATED FOR NEW HTTPS ENDPOINTS
 """
 
 import os
-from typing import Dict, Set
+from typing import Dict, FrozenSet
 
 class Settings:
     """Application settings"""
@@ -15,13 +15,17 @@ class Settings:
     SERVICE_VERSION: str = "2.0.0"
     SERVICE_PORT: int = int(os.getenv("SERVICE_PORT", 8002))
     ENV: str = os.getenv("ENV", "development")
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "info")
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()  # Normalized once here
+    LOG_FILE_MAX_BYTES: int = int(os.getenv("LOG_FILE_MAX_BYTES", 10_000_000))
+    LOG_FILE_BACKUP_COUNT: int = int(os.getenv("LOG_FILE_BACKUP_COUNT", 3))
     
     # API Configuration
     API_TITLE: str = "Analytics Service"
     API_DESCRIPTION: str = "Medical Laboratory Data Analytics - Wirgilio Integration"
     DOCS_URL: str = "/docs"
     REDOC_URL: str = "/redoc"
+    CORS_MAX_AGE_SECONDS: int = int(os.getenv("CORS_MAX_AGE_SECONDS", 86400))
+    ANALYTICS_CACHE_MAX_AGE_SECONDS: int = int(os.getenv("ANALYTICS_CACHE_MAX_AGE_SECONDS", 30))
     
     # UPDATED: Wirgilio API Configuration for NEW HTTPS Endpoints
     WIRGILIO_BASE_URL: str = os.getenv("WIRGILIO_BASE_URL", "https://10.10.13.14")
@@ -34,23 +38,31 @@ class Settings:
     # NEW: SSL Configuration
     WIRGILIO_VERIFY_SSL: bool = os.getenv("WIRGILIO_VERIFY_SSL", "true").lower() == "true"
     WIRGILIO_SSL_TIMEOUT: int = int(os.getenv("WIRGILIO_SSL_TIMEOUT", "30"))
+    # Startup warmup is best effort - never hold the service out of rotation longer than this
+    WIRGILIO_WARMUP_TIMEOUT_SECONDS: float = float(os.getenv("WIRGILIO_WARMUP_TIMEOUT_SECONDS", 5))
     
     # Analytics Configuration
     ANALYTICS_TIMEOUT_SECONDS: int = int(os.getenv("ANALYTICS_TIMEOUT_SECONDS", 120))
     MAX_CHART_DATA_POINTS: int = int(os.getenv("MAX_CHART_DATA_POINTS", 1000))
     MAX_RETRIES: int = 3
     RETRY_DELAY_SECONDS: int = 2
+    CODOFFERING_CACHE_TTL_SECONDS: float = float(os.getenv("CODOFFERING_CACHE_TTL_SECONDS", 60))
     
-    # COMPUTED: Full API URLs
-    @property
-    def WIRGILIO_API_BASE(self) -> str:
-        """Complete base URL for Wirgilio API"""
-        return f"{self.WIRGILIO_BASE_URL}{self.WIRGILIO_API_PATH}"
+    # MongoDB connection pool - minPoolSize keeps warm sockets so early requests skip the
+    # handshake; requests queue at most MONGO_WAIT_QUEUE_TIMEOUT_MS for a socket
+    MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", 50))
+    MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", 10))
+    MONGO_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 60000))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000))
+    # Wire compression - zlib ships with Python; zstd/snappy can be listed first once
+    # their driver extras are installed
+    MONGO_COMPRESSORS: str = os.getenv("MONGO_COMPRESSORS", "zlib")
+    MONGO_ZLIB_COMPRESSION_LEVEL: int = int(os.getenv("MONGO_ZLIB_COMPRESSION_LEVEL", 6))
     
-    @property 
-    def WIRGILIO_ENDPOINT(self) -> str:
-        """Complete endpoint for laboratory data"""
-        return self.WIRGILIO_ESAMI_ENDPOINT
+    def __init__(self):
+        # COMPUTED once: Full API URLs
+        self.WIRGILIO_API_BASE: str = f"{self.WIRGILIO_BASE_URL}{self.WIRGILIO_API_PATH}"  # Complete base URL for Wirgilio API
+        self.WIRGILIO_ENDPOINT: str = self.WIRGILIO_ESAMI_ENDPOINT  # Complete endpoint for laboratory data
 
 # Initialize settings
 settings = Settings()
@@ -58,16 +70,16 @@ settings = Settings()
 # Data validation constraints
 DATA_CONSTRAINTS = {
     # Invalid value patterns to skip
-    "INVALID_VALUES": {"-3.0", "", "campione insufficiente", "non determinabile", "nd", "n.d."},
+    "INVALID_VALUES": frozenset({"-3.0", "", "campione insufficiente", "non determinabile", "nd", "n.d."}),
     
     # Valid anomaly flags (treat anything else as normal)
-    "VALID_ANOMALY_FLAGS": {"N", "P", "AP"},
+    "VALID_ANOMALY_FLAGS": frozenset({"N", "P", "AP"}),
     
     # Anomaly flags that should trigger red color
-    "ANOMALY_FLAGS": {"P", "AP"},
+    "ANOMALY_FLAGS": frozenset({"P", "AP"}),
     
     # Normal flags
-    "NORMAL_FLAGS": {"N"},
+    "NORMAL_FLAGS": frozenset({"N"}),
     
     # Minimum data points required for charting (even 1 point should be shown)
     "MIN_CHART_POINTS": 1,
@@ -84,7 +96,7 @@ CHART_COLORS: Dict[str, str] = {
 }
 
 # Diabetes-related exam codes (only for filtering relevant exams)
-DIABETES_RELEVANT_CODES: Set[str] = {
+DIABETES_RELEVANT_CODES: FrozenSet[str] = frozenset({
     "301", "301U",    # GLUCOSIO
     "302", "302U",    # UREA  
     "303", "303U",    # CREATININA
@@ -96,4 +108,4 @@ DIABETES_RELEVANT_CODES: Set[str] = {
     "MY", "MYU",      # MIOGLOBINA
     "TR", "TRU",      # TROPONINA
     "CM", "CMU"       # CK-MB
-}
\ No newline at end of file
+})
\ No newline at end of file
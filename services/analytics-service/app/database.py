@@ -4,16 +4,21 @@ Analytics Service Database Connection
 MongoDB connection for exam mapping queries
 """
 
+import asyncio
 import os
 import logging
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.database import AsyncDatabase
 from typing import List, Dict, Optional, Any
 
+from .config import settings
+
 logger = logging.getLogger(__name__)
 
 # Global database client
-mongodb_client: AsyncIOMotorClient = None
-database: AsyncIOMotorDatabase = None
+mongodb_client: AsyncMongoClient = None
+database: AsyncDatabase = None
+_connect_lock = asyncio.Lock()  # Serializes lazy connection in get_database
 
 async def connect_to_mongo():
     """Create database connection to same diabetes_db as other services"""
@@ -27,11 +32,18 @@ async def connect_to_mongo():
         
         logger.info(f"🔗 Analytics connecting to MongoDB: {mongodb_url.split('@')[1] if '@' in mongodb_url else mongodb_url}")
         
-        mongodb_client = AsyncIOMotorClient(
+        # Native asyncio driver - no executor thread hop per query as with Motor
+        mongodb_client = AsyncMongoClient(
             mongodb_url,
+            appname=settings.SERVICE_NAME,  # Attributes this service's ops in server logs/currentOp
+            compressors=settings.MONGO_COMPRESSORS,
+            zlibCompressionLevel=settings.MONGO_ZLIB_COMPRESSION_LEVEL,
             serverSelectionTimeoutMS=5000,
             connectTimeoutMS=5000,
-            maxPoolSize=10
+            maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+            waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS
         )
         
         # Use same database as admin dashboard and timeline service
@@ -51,14 +63,17 @@ async def close_mongo_connection():
     global mongodb_client
     
     if mongodb_client is not None:
-        mongodb_client.close()
+        await mongodb_client.close()
         logger.info("🔌 Analytics MongoDB connection closed")
 
-async def get_database() -> AsyncIOMotorDatabase:
+async def get_database() -> AsyncDatabase:
     """Get database instance"""
     global database
     
     if database is None:
-        await connect_to_mongo()
+        # Only the first of concurrent cold-start callers connects; the rest wait for it
+        async with _connect_lock:
+            if database is None:
+                await connect_to_mongo()
     
     return database
\ No newline at end of file
@@ -4,7 +4,7 @@ Analytics Service Custom Exceptions
 Clean exception hierarchy for analytics operations and error handling
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Tuple, Any
 from fastapi import HTTPException, status
 
 # ================================
@@ -79,119 +79,38 @@ class InsufficientDataException(AnalyticsServiceException):
 # HTTP EXCEPTION MAPPING
 # ================================
 
+# Status code and error code per exception class - resolved through the MRO, so a
+# subclass without its own entry maps like its nearest mapped parent
+_EXCEPTION_HTTP_MAP: Dict[type, Tuple[int, str]] = {
+    InvalidCodiceFiscaleException: (status.HTTP_400_BAD_REQUEST, "INVALID_CODICE_FISCALE"),
+    WirgilioAuthenticationException: (status.HTTP_401_UNAUTHORIZED, "WIRGILIO_AUTHENTICATION_ERROR"),
+    WirgilioDataNotFoundException: (status.HTTP_404_NOT_FOUND, "PATIENT_DATA_NOT_FOUND"),
+    ExamNotFoundException: (status.HTTP_404_NOT_FOUND, "EXAM_NOT_FOUND"),
+    SottanalisiNotFoundException: (status.HTTP_404_NOT_FOUND, "SOTTANALISI_NOT_FOUND"),
+    WirgilioTimeoutException: (status.HTTP_504_GATEWAY_TIMEOUT, "WIRGILIO_TIMEOUT"),
+    WirgilioAPIException: (status.HTTP_502_BAD_GATEWAY, "WIRGILIO_API_ERROR"),
+    NoValidDataException: (status.HTTP_422_UNPROCESSABLE_ENTITY, "NO_VALID_DATA"),
+    InsufficientDataException: (status.HTTP_422_UNPROCESSABLE_ENTITY, "INSUFFICIENT_DATA"),
+    DataProcessingException: (status.HTTP_422_UNPROCESSABLE_ENTITY, "DATA_PROCESSING_ERROR"),
+    # Generic analytics service exception
+    AnalyticsServiceException: (status.HTTP_500_INTERNAL_SERVER_ERROR, "ANALYTICS_SERVICE_ERROR"),
+}
+
 def map_to_http_exception(exception: AnalyticsServiceException) -> HTTPException:
     """Map analytics service exceptions to HTTP exceptions"""
     
-    if isinstance(exception, InvalidCodiceFiscaleException):
-        return HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail={
-                "error": "INVALID_CODICE_FISCALE",
-                "message": exception.message,
-                "details": exception.details
-            }
-        )
-    
-    if isinstance(exception, WirgilioAuthenticationException):
-        return HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={
-                "error": "WIRGILIO_AUTHENTICATION_ERROR",
-                "message": exception.message,
-                "details": exception.details
-            }
-        )
-    
-    if isinstance(exception, WirgilioDataNotFoundException):
-        return HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={
-                "error": "PATIENT_DATA_NOT_FOUND", 
-                "message": exception.message,
-                "details": exception.details
-            }
-        )
-    
-    if isinstance(exception, ExamNotFoundException):
-        return HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={
-                "error": "EXAM_NOT_FOUND",
-                "message": exception.message,
-                "details": exception.details
-            }
-        )
-    
-    if isinstance(exception, SottanalisiNotFoundException):
-        return HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={
-                "error": "SOTTANALISI_NOT_FOUND",
-                "message": exception.message,
-                "details": exception.details
-            }
-        )
-    
-    if isinstance(exception, WirgilioTimeoutException):
-        return HTTPException(
-            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
-            detail={
-                "error": "WIRGILIO_TIMEOUT",
-                "message": exception.message,
-                "details": exception.details
-            }
-        )
-    
-    if isinstance(exception, WirgilioAPIException):
-        return HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail={
-                "error": "WIRGILIO_API_ERROR",
-                "message": exception.message,
-                "details": exception.details
-            }
-        )
-    
-    if isinstance(exception, NoValidDataException):
-        return HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail={
-                "error": "NO_VALID_DATA",
-                "message": exception.message,
-                "details": exception.details
-            }
-        )
-    
-    if isinstance(exception, InsufficientDataException):
-        return HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail={
-                "error": "INSUFFICIENT_DATA",
-                "message": exception.message,
-                "details": exception.details
-            }
-        )
-    
-    if isinstance(exception, DataProcessingException):
-        return HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail={
-                "error": "DATA_PROCESSING_ERROR",
-                "message": exception.message,
-                "details": exception.details
-            }
-        )
-    
-    # Generic analytics service exception
-    if isinstance(exception, AnalyticsServiceException):
-        return HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={
-                "error": "ANALYTICS_SERVICE_ERROR",
-                "message": exception.message,
-                "details": exception.details
-            }
-        )
+    for exception_class in type(exception).__mro__:
+        mapping = _EXCEPTION_HTTP_MAP.get(exception_class)
+        if mapping is not None:
+            status_code, error_code = mapping
+            return HTTPException(
+                status_code=status_code,
+                detail={
+                    "error": error_code,
+                    "message": exception.message,
+                    "details": exception.details
+                }
+            )
     
     # Fallback for unexpected exceptions
     return HTTPException(
@@ -201,4 +120,4 @@ def map_to_http_exception(exception: AnalyticsServiceException) -> HTTPException
             "message": "An unexpected error occurred",
             "details": {"original_error": str(exception)}
         }
-    )
\ No newline at end of file
+    )
@@ -4,9 +4,11 @@ Analytics Service Data Filtering
 Filters Wirgilio data based on admin-configured exam mappings
 """
 
-from typing import List, Dict, Set, Any, Optional
+from typing import List, Dict, FrozenSet, Tuple, Any, Optional
 import logging
+import time
 
+from .config import settings
 from .repositories import ExamMappingRepository
 
 logger = logging.getLogger(__name__)
@@ -16,10 +18,12 @@ class ExamFilteringService:
     
     def __init__(self, mapping_repo: ExamMappingRepository):
         self.mapping_repo = mapping_repo
-        self._cached_codes: Optional[Set[str]] = None
-        self._cache_cronoscita_id: Optional[str] = None
+        # Allowed codes per cronoscita_id as (fetched_at, codes); the service is an
+        # app-wide singleton, so the cache lives as long as the app
+        self._cache: Dict[Optional[str], Tuple[float, FrozenSet[str]]] = {}
+        self._ttl: float = settings.CODOFFERING_CACHE_TTL_SECONDS
     
-    async def get_allowed_codoffering_codes(self, cronoscita_id: Optional[str] = None) -> Set[str]:
+    async def get_allowed_codoffering_codes(self, cronoscita_id: Optional[str] = None) -> FrozenSet[str]:
         """
         Get set of allowed codoffering codes with caching
         
@@ -27,30 +31,32 @@ class ExamFilteringService:
             cronoscita_id: Optional Cronoscita filter
             
         Returns:
-            Set of allowed codoffering_wirgilio codes
+            Frozen set of allowed codoffering_wirgilio codes
         """
-        # Simple cache check (in production, consider Redis caching)
-        if (self._cached_codes is not None and 
-            self._cache_cronoscita_id == cronoscita_id):
-            return self._cached_codes
+        # Serve from memory while the entry for this Cronoscita is fresh
+        entry = self._cache.get(cronoscita_id)
+        if entry is not None and time.monotonic() - entry[0] < self._ttl:
+            return entry[1]
         
         # Fetch from database
-        codes = await self.mapping_repo.get_active_codoffering_codes(cronoscita_id)
+        codes = frozenset(await self.mapping_repo.get_active_codoffering_codes(cronoscita_id))
         
         # Cache the result
-        self._cached_codes = codes
-        self._cache_cronoscita_id = cronoscita_id
+        self._cache[cronoscita_id] = (time.monotonic(), codes)
         
         logger.info(f"Allowed codoffering codes: {sorted(codes)}")
         return codes
     
-    def filter_wirgilio_data(self, raw_data: List[Dict[str, Any]], allowed_codes: Set[str]) -> List[Dict[str, Any]]:
+    def filter_wirgilio_data(self, raw_data: List[Dict[str, Any]], allowed_codes: FrozenSet[str]) -> List[Dict[str, Any]]:
         """
         Filter raw Wirgilio data to only include mapped exams
         
+        The kept reports are the raw_data dicts themselves with "esami" replaced, so
+        raw_data must not be reused afterwards (callers pass the freshly parsed response)
+        
         Args:
             raw_data: Raw data from Wirgilio API
-            allowed_codes: Set of allowed codoffering codes
+            allowed_codes: Frozen set of allowed codoffering codes
             
         Returns:
             Filtered data containing only mapped exams
@@ -59,6 +65,8 @@ class ExamFilteringService:
             logger.warning("No allowed codes found - returning empty dataset")
             return []
         
+        # Local frozenset binding - the per-exam loop is the hot path of every analytics request
+        allowed = allowed_codes if isinstance(allowed_codes, frozenset) else frozenset(allowed_codes)
         filtered_data = []
         total_reports = len(raw_data)
         filtered_reports = 0
@@ -67,25 +75,22 @@ class ExamFilteringService:
         
         for report in raw_data:
             # Get exams from this report
-            exams = report.get("esami", [])
+            exams = report.get("esami") or ()
             total_exams_before += len(exams)
             
-            # Filter exams by allowed codes
+            # Filter exams by allowed codes - admin codes are stored stripped, so an exact
+            # hit skips allocating a stripped copy of the exam's code
             filtered_exams = []
             for esame in exams:
-                codoffering = esame.get("codoffering", "").strip()
-                
-                if codoffering in allowed_codes:
+                codoffering = esame.get("codoffering")
+                if codoffering in allowed or (codoffering and codoffering.strip() in allowed):
                     filtered_exams.append(esame)
-                    total_exams_after += 1
-                else:
-                    logger.debug(f"Filtered out exam with codoffering: {codoffering}")
             
-            # Only include report if it has filtered exams
+            # Only include report if it has filtered exams - reused in place, not copied
             if filtered_exams:
-                filtered_report = report.copy()
-                filtered_report["esami"] = filtered_exams
-                filtered_data.append(filtered_report)
+                total_exams_after += len(filtered_exams)
+                report["esami"] = filtered_exams
+                filtered_data.append(report)
                 filtered_reports += 1
         
         logger.info(f"Filtering results:")
@@ -6,23 +6,50 @@ Professional FastAPI application for medical laboratory data analytics
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+import asyncio
 import logging
+import logging.handlers
 import sys
 import os
-from .database import connect_to_mongo, close_mongo_connection
+from .database import connect_to_mongo, close_mongo_connection, get_database
 # Import our modules
 from .config import settings
 from .routers import get_all_routers
 from .exceptions import AnalyticsServiceException, map_to_http_exception
+from .services import WirgilioService, DataProcessingService, AnalyticsService
+from .repositories import ExamMappingRepository
+from .filtering import ExamFilteringService
 
-# Configure logging
+# Configure logging - file records are batched in memory and written when the
+# buffer fills, on any ERROR record, or at shutdown; the file rotates at LOG_FILE_MAX_BYTES
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_LEVELS = {
+    "CRITICAL": logging.CRITICAL,
+    "ERROR": logging.ERROR,
+    "WARNING": logging.WARNING,
+    "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG
+}
+log_file_handler = logging.handlers.RotatingFileHandler(
+    f"/tmp/{settings.SERVICE_NAME}.log",
+    mode="a",
+    maxBytes=settings.LOG_FILE_MAX_BYTES,
+    backupCount=settings.LOG_FILE_BACKUP_COUNT
+)
+log_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+log_file_buffer = logging.handlers.MemoryHandler(
+    capacity=512,
+    flushLevel=logging.ERROR,
+    target=log_file_handler,
+    flushOnClose=True
+)
 logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL.upper()),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    level=LOG_LEVELS.get(settings.LOG_LEVEL, logging.INFO),
+    format=LOG_FORMAT,
     handlers=[
         logging.StreamHandler(sys.stdout),
-        logging.FileHandler(f"/tmp/{settings.SERVICE_NAME}.log", mode="a")
+        log_file_buffer
     ]
 )
 logger = logging.getLogger(__name__)
@@ -58,6 +85,9 @@ def get_cors_origins():
     
     return base_origins
 
+# Resolved once at import - deduplicated, order preserved
+CORS_ORIGINS = tuple(dict.fromkeys(get_cors_origins()))
+
 def create_application() -> FastAPI:
     """
     Create and configure the FastAPI analytics application with database support
@@ -69,6 +99,7 @@ def create_application() -> FastAPI:
         version=settings.SERVICE_VERSION,
         docs_url=settings.DOCS_URL,
         redoc_url=settings.REDOC_URL,
+        default_response_class=ORJSONResponse,  # Route payloads encoded by orjson's C encoder
         openapi_tags=[
             {
                 "name": "Medical Analytics",
@@ -84,10 +115,11 @@ def create_application() -> FastAPI:
     # CORS middleware
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=get_cors_origins(),
+        allow_origins=CORS_ORIGINS,
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        allow_headers=["*"]
+        allow_headers=["*"],
+        max_age=settings.CORS_MAX_AGE_SECONDS  # Browsers cache the preflight instead of repeating OPTIONS
     )
 
     # Global exception handler
@@ -100,9 +132,32 @@ def create_application() -> FastAPI:
     # Database lifecycle events
     @app.on_event("startup")
     async def startup_event():
-        """Initialize database connection on startup"""
+        """Initialize database connection and shared services on startup"""
+        # Stateless/long-lived services are built once and handed out by the dependencies
+        app.state.wirgilio_service = WirgilioService()
+        app.state.data_processing_service = DataProcessingService()
+        
         try:
-            await connect_to_mongo()
+            # MongoDB connect and Wirgilio warmup are independent network waits - run together.
+            # warmup() never raises, so a connect failure still propagates from gather
+            _, wirgilio_ready = await asyncio.gather(
+                connect_to_mongo(),
+                app.state.wirgilio_service.warmup()
+            )
+            
+            # The whole service graph is stateless - built once, returned by the dependencies
+            app.state.exam_mapping_repository = ExamMappingRepository(await get_database())
+            app.state.filtering_service = ExamFilteringService(app.state.exam_mapping_repository)
+            app.state.analytics_service = AnalyticsService(
+                app.state.wirgilio_service,
+                app.state.data_processing_service,
+                app.state.filtering_service
+            )
+            
+            if wirgilio_ready:
+                logger.info("✅ Wirgilio connection pool warmed up")
+            else:
+                logger.warning("⚠️ Wirgilio not reachable at startup - connections will open on first request")
             logger.info("✅ Analytics service startup complete with database connection")
         except Exception as e:
             logger.error(f"❌ Failed to connect to database during startup: {e}")
@@ -110,36 +165,20 @@ def create_application() -> FastAPI:
 
     @app.on_event("shutdown")
     async def shutdown_event():
-        """Close database connection on shutdown"""
+        """Close database connection and Wirgilio client on shutdown"""
         try:
             await close_mongo_connection()
+            await app.state.wirgilio_service.close()
             logger.info("✅ Analytics service shutdown complete")
         except Exception as e:
             logger.error(f"❌ Error during shutdown: {e}")
+        finally:
+            log_file_buffer.flush()
 
     # Include routers
     for router in get_all_routers():
         app.include_router(router)
 
-    # Update root endpoint
-    @app.get("/")
-    async def read_root():
-        """Root endpoint with filtering information"""
-        return {
-            "service": "Servizio Analytics ASL",
-            "version": settings.SERVICE_VERSION,
-            "status": "operativo",
-            "integration": "wirgilio-api",
-            "filtering": "admin-configured",
-            "endpoints": {
-                "exam_list": "GET /analytics/laboratory-exams/{codice_fiscale}?cronoscita_id=...",
-                "sottanalisi_list": "GET /analytics/sottanalisi/{codice_fiscale}?exam_key=...&cronoscita_id=...",
-                "chart_data": "GET /analytics/chart-data/{codice_fiscale}?exam_key=...&dessottoanalisi=...&cronoscita_id=...",
-                "filtering_info": "GET /analytics/filtering-info?cronoscita_id=...",
-                "frontend_app": "GET /analytics-app"
-            }
-        }
-
     return app
 
 # Create the app instance
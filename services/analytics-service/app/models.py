@@ -4,11 +4,19 @@ Analytics Service Data Models
 Pydantic models for Wirgilio API integration and medical data analytics
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+from typing import Annotated, Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
-import re
+
+# Italian fiscal code - checked and uppercased inside pydantic-core, no Python validator.
+# The pattern runs before to_upper, hence the inline case-insensitive flag
+CodiceFiscale = Annotated[str, StringConstraints(
+    min_length=16,
+    max_length=16,
+    to_upper=True,
+    pattern=r'(?i)^[A-Z]{6}[0-9]{2}[A-Z][0-9]{2}[A-Z][0-9]{3}[A-Z]$'
+)]
 
 # ================================
 # ENUMS
@@ -26,21 +34,20 @@ class AnomalyStatus(str, Enum):
 
 class AnalyticsRequest(BaseModel):
     """Base analytics request with CF validation"""
-    codice_fiscale: str = Field(..., min_length=16, max_length=16, description="Codice fiscale paziente")
-    
-    @validator('codice_fiscale')
-    def validate_codice_fiscale(cls, v):
-        """Validate Italian fiscal code format"""
-        if not re.match(r'^[A-Z]{6}[0-9]{2}[A-Z][0-9]{2}[A-Z][0-9]{3}[A-Z]$', v.upper()):
-            raise ValueError('Formato codice fiscale non valido')
-        return v.upper()
+    codice_fiscale: CodiceFiscale = Field(..., description="Codice fiscale paziente")
 
 # ================================
 # WIRGILIO DATA MODELS
 # ================================
 
+# Unknown Wirgilio fields are dropped and strings trimmed inside pydantic-core; the
+# validators are only built the first time a Wirgilio payload is parsed
+WIRGILIO_MODEL_CONFIG = ConfigDict(extra="ignore", str_strip_whitespace=True, defer_build=True)
+
 class WirgilioRisultato(BaseModel):
     """Single test result from Wirgilio API"""
+    model_config = WIRGILIO_MODEL_CONFIG
+    
     dessottoanalisi: str
     valore: str
     unitadimisura: Optional[str] = ""
@@ -51,12 +58,16 @@ class WirgilioRisultato(BaseModel):
 
 class WirgilioEsame(BaseModel):
     """Single exam from Wirgilio API"""
+    model_config = WIRGILIO_MODEL_CONFIG
+    
     desesame: str
     codoffering: str
     risultati: List[WirgilioRisultato]
 
 class WirgilioReport(BaseModel):
     """Complete laboratory report from Wirgilio API"""
+    model_config = WIRGILIO_MODEL_CONFIG
+    
     codicefiscale: str
     nome: str
     cognome: str
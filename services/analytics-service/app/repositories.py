@@ -5,7 +5,7 @@ Data access layer for exam mapping queries
 """
 
 from typing import List, Dict, Set, Optional, Any
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.asynchronous.database import AsyncDatabase
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,7 +13,7 @@ logger = logging.getLogger(__name__)
 class ExamMappingRepository:
     """Repository for exam mapping data access"""
     
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncDatabase):
         self.db = db
         self.collection = db.exam_mappings
     
@@ -38,19 +38,17 @@ class ExamMappingRepository:
             if cronoscita_id:
                 query["cronoscita_id"] = cronoscita_id
             
-            # Project only the codoffering_wirgilio field
-            cursor = self.collection.find(
-                query,
-                {"codoffering_wirgilio": 1, "_id": 0}
-            )
-            
-            results = await cursor.to_list(length=None)
+            # Missing/empty codes are excluded server-side
+            query["codoffering_wirgilio"] = {"$nin": [None, ""]}
             
-            # Extract codes and convert to set for fast lookup
-            codes = set()
-            for result in results:
-                if result.get("codoffering_wirgilio"):
-                    codes.add(result["codoffering_wirgilio"].strip())
+            # Project only the codoffering_wirgilio field and stream it straight into a set
+            codes = {
+                result["codoffering_wirgilio"].strip()
+                async for result in self.collection.find(
+                    query,
+                    {"codoffering_wirgilio": 1, "_id": 0}
+                )
+            }
             
             logger.info(f"📋 Found {len(codes)} active codoffering codes for filtering")
             return codes
@@ -70,11 +68,21 @@ class ExamMappingRepository:
             Mapping info with catalog details or None
         """
         try:
-            mapping = await self.collection.find_one({
-                "codoffering_wirgilio": codoffering_wirgilio,
-                "is_active": True,
-                "visualizza_nel_referto": "S"
-            })
+            # Project only the fields returned below
+            mapping = await self.collection.find_one(
+                {
+                    "codoffering_wirgilio": codoffering_wirgilio,
+                    "is_active": True,
+                    "visualizza_nel_referto": "S"
+                },
+                {
+                    "_id": 0,
+                    "codice_catalogo": 1,
+                    "nome_esame_wirgilio": 1,
+                    "struttura_nome": 1,
+                    "cronoscita_id": 1
+                }
+            )
             
             if mapping:
                 return {
@@ -93,11 +101,18 @@ class ExamMappingRepository:
     async def get_mapping_statistics(self) -> Dict[str, Any]:
         """Get statistics about exam mappings for analytics"""
         try:
-            total_mappings = await self.collection.count_documents({"is_active": True})
-            visible_mappings = await self.collection.count_documents({
-                "is_active": True,
-                "visualizza_nel_referto": "S"
-            })
+            # Both counts in one pass over the active mappings
+            cursor = await self.collection.aggregate([
+                {"$match": {"is_active": True}},
+                {"$group": {
+                    "_id": None,
+                    "total": {"$sum": 1},
+                    "visible": {"$sum": {"$cond": [{"$eq": ["$visualizza_nel_referto", "S"]}, 1, 0]}}
+                }}
+            ])
+            counts = await cursor.to_list(length=1)
+            total_mappings = counts[0]["total"] if counts else 0
+            visible_mappings = counts[0]["visible"] if counts else 0
             
             return {
                 "total_active_mappings": total_mappings,
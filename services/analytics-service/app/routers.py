@@ -5,12 +5,14 @@ Clean organization of routes with proper dependency injection
 API endpoints for Wirgilio integration and medical data analytics
 """
 
-from fastapi import APIRouter, Depends, Query, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.responses import HTMLResponse, ORJSONResponse
+from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional, Dict, Any
+import hashlib
 import logging
-from .database import get_database
+import orjson
 from .repositories import ExamMappingRepository
 from .filtering import ExamFilteringService
 from .services import WirgilioService, DataProcessingService, AnalyticsService
@@ -26,31 +28,25 @@ logger = logging.getLogger(__name__)
 # DEPENDENCY INJECTION
 # ================================
 
-async def get_wirgilio_service() -> WirgilioService:
-    """Get Wirgilio service instance"""
-    return WirgilioService()
+async def get_wirgilio_service(request: Request) -> WirgilioService:
+    """Get the Wirgilio service created at startup (shared HTTP connection pool)"""
+    return request.app.state.wirgilio_service
 
-async def get_data_processing_service() -> DataProcessingService:
-    """Get data processing service instance"""
-    return DataProcessingService()
+async def get_data_processing_service(request: Request) -> DataProcessingService:
+    """Get the stateless data processing service created at startup"""
+    return request.app.state.data_processing_service
 
-async def get_exam_mapping_repository(db = Depends(get_database)) -> ExamMappingRepository:
-    """Get exam mapping repository instance"""
-    return ExamMappingRepository(db)
+async def get_exam_mapping_repository(request: Request) -> ExamMappingRepository:
+    """Get the exam mapping repository created at startup"""
+    return request.app.state.exam_mapping_repository
 
-async def get_filtering_service(
-    mapping_repo: ExamMappingRepository = Depends(get_exam_mapping_repository)
-) -> ExamFilteringService:
-    """Get filtering service instance"""
-    return ExamFilteringService(mapping_repo)
+async def get_filtering_service(request: Request) -> ExamFilteringService:
+    """Get the filtering service created at startup"""
+    return request.app.state.filtering_service
 
-async def get_analytics_service(
-    wirgilio_service: WirgilioService = Depends(get_wirgilio_service),
-    data_service: DataProcessingService = Depends(get_data_processing_service),
-    filtering_service: ExamFilteringService = Depends(get_filtering_service)
-) -> AnalyticsService:
-    """Get main analytics service instance with filtering support"""
-    return AnalyticsService(wirgilio_service, data_service, filtering_service)
+async def get_analytics_service(request: Request) -> AnalyticsService:
+    """Get the main analytics service (with filtering support) created at startup"""
+    return request.app.state.analytics_service
 
 # ================================
 # MAIN API ROUTER
@@ -58,21 +54,24 @@ async def get_analytics_service(
 
 main_router = APIRouter()
 
+# Constant service information - encoded once and returned as-is
+ROOT_RESPONSE = ORJSONResponse({
+    "service": "Servizio Analytics ASL",
+    "version": settings.SERVICE_VERSION,
+    "status": "operativo",
+    "integration": "wirgilio-api",
+    "endpoints": {
+        "exam_list": "GET /analytics/laboratory-exams/{codice_fiscale}",
+        "sottanalisi_list": "GET /analytics/sottanalisi/{codice_fiscale}",
+        "chart_data": "GET /analytics/chart-data/{codice_fiscale}",
+        "frontend_app": "GET /analytics-app"
+    }
+})
+
 @main_router.get("/")
 async def read_root():
     """Root endpoint with service information"""
-    return {
-        "service": "Servizio Analytics ASL",
-        "version": settings.SERVICE_VERSION,
-        "status": "operativo",
-        "integration": "wirgilio-api",
-        "endpoints": {
-            "exam_list": "GET /analytics/laboratory-exams/{codice_fiscale}",
-            "sottanalisi_list": "GET /analytics/sottanalisi/{codice_fiscale}",
-            "chart_data": "GET /analytics/chart-data/{codice_fiscale}",
-            "frontend_app": "GET /analytics-app"
-        }
-    }
+    return ROOT_RESPONSE
 
 @main_router.get("/health", response_model=HealthResponse)
 async def health_check(wirgilio_service: WirgilioService = Depends(get_wirgilio_service)):
@@ -98,10 +97,26 @@ async def health_check(wirgilio_service: WirgilioService = Depends(get_wirgilio_
 # ANALYTICS API ROUTES
 # ================================
 
+# Patient data - cacheable by the browser only, briefly, and revalidated through the ETag
+ANALYTICS_CACHE_CONTROL = f"private, max-age={settings.ANALYTICS_CACHE_MAX_AGE_SECONDS}"
+
+def etag_json_response(request: Request, result: BaseModel) -> Response:
+    """Encode a result with an ETag; answer 304 when the client already holds it"""
+    body = orjson.dumps(result.model_dump(mode="json"))
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": ANALYTICS_CACHE_CONTROL}
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    
+    return Response(body, media_type="application/json", headers=headers)
+
 analytics_router = APIRouter(prefix="/analytics", tags=["Medical Analytics"])
 
 @analytics_router.get("/laboratory-exams/{codice_fiscale}", response_model=ExamListResponse)
 async def get_exam_list(
+    request: Request,
     codice_fiscale: str,
     cronoscita_id: Optional[str] = Query(None, description="Optional Cronoscita filter"),
     analytics_service: AnalyticsService = Depends(get_analytics_service)
@@ -114,7 +129,8 @@ async def get_exam_list(
     """
     try:
         logger.info(f"Getting filtered exam list for CF: {codice_fiscale}, Cronoscita: {cronoscita_id}")
-        return await analytics_service.get_exam_summaries(codice_fiscale, cronoscita_id)
+        result = await analytics_service.get_exam_summaries(codice_fiscale, cronoscita_id)
+        return etag_json_response(request, result)
     except AnalyticsServiceException as e:
         raise map_to_http_exception(e)
     except Exception as e:
@@ -123,6 +139,7 @@ async def get_exam_list(
 
 @analytics_router.get("/sottanalisi/{codice_fiscale}", response_model=SottanalisiListResponse)
 async def get_sottanalisi_list(
+    request: Request,
     codice_fiscale: str,
     exam_key: str = Query(..., description="Exam key (desesame)"),
     cronoscita_id: Optional[str] = Query(None, description="Optional Cronoscita filter"),
@@ -135,14 +152,15 @@ async def get_sottanalisi_list(
     """
     try:
         logger.info(f"Getting filtered sottanalisi for CF: {codice_fiscale}, exam: {exam_key}, Cronoscita: {cronoscita_id}")
-        return await analytics_service.get_sottanalisi_for_exam(codice_fiscale, exam_key, cronoscita_id)
+        result = await analytics_service.get_sottanalisi_for_exam(codice_fiscale, exam_key, cronoscita_id)
+        return etag_json_response(request, result)
     except AnalyticsServiceException as e:
         raise map_to_http_exception(e)
     except Exception as e:
         logger.error(f"Unexpected error getting sottanalisi: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@analytics_router.get("/chart-data/{codice_fiscale}", response_model=ChartDataResponse)
+@analytics_router.get("/chart-data/{codice_fiscale}", response_model=ChartDataResponse, response_class=ORJSONResponse)
 async def get_chart_data(
     codice_fiscale: str,
     exam_key: str = Query(..., description="Exam key (desesame)"),
@@ -30,19 +30,51 @@ class WirgilioService:
         self.base_url = settings.WIRGILIO_API_BASE
         self.token = settings.WIRGILIO_TOKEN
         self.timeout = settings.ANALYTICS_TIMEOUT_SECONDS
+        self.headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Content-Type": "application/json"
+        }
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client - keeps TLS connections to Wirgilio alive between requests"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                verify=settings.WIRGILIO_VERIFY_SSL,
+                headers=self.headers
+            )
+        return self._client
+    
+    async def warmup(self, connections: int = 2) -> bool:
+        """Open pooled connections to Wirgilio ahead of the first analytics request"""
+        # Bounded separately from the 120 s request timeout, so an unresponsive
+        # Wirgilio delays startup by at most WIRGILIO_WARMUP_TIMEOUT_SECONDS
+        try:
+            results = await asyncio.wait_for(
+                asyncio.gather(*(self.test_connection() for _ in range(connections))),
+                timeout=settings.WIRGILIO_WARMUP_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Wirgilio warmup timed out after {settings.WIRGILIO_WARMUP_TIMEOUT_SECONDS}s"
+            )
+            return False
+        return any(results)
+    
+    async def close(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def test_connection(self) -> bool:
         """Test connection to Wirgilio API"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, verify=settings.WIRGILIO_VERIFY_SSL) as client:
-                headers = {
-                    "Authorization": f"Bearer {self.token}",
-                    "Content-Type": "application/json"
-                }
-                
-                # Test with a simple endpoint
-                response = await client.get(f"{self.base_url}/health", headers=headers)
-                return response.status_code == 200
+            # Test with a simple endpoint
+            response = await self.client.get(f"{self.base_url}/health")
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Wirgilio connection test failed: {e}")
             return False
@@ -55,57 +87,51 @@ class WirgilioService:
     ) -> List[Dict[str, Any]]:
         """Fetch laboratory data from Wirgilio API with optional filtering"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, verify=settings.WIRGILIO_VERIFY_SSL) as client:
-                headers = {
-                    "Authorization": f"Bearer {self.token}",
-                    "Content-Type": "application/json"
-                }
-                
-                url = f"{self.base_url}{settings.WIRGILIO_ENDPOINT}"
-                params = {"codicefiscale": codice_fiscale}
-                
-                logger.info(f"Fetching Wirgilio data for CF: {codice_fiscale}")
-                
-                for attempt in range(settings.MAX_RETRIES):
-                    try:
-                        response = await client.get(url, headers=headers, params=params)
+            url = f"{self.base_url}{settings.WIRGILIO_ENDPOINT}"
+            params = {"codicefiscale": codice_fiscale}
+            
+            logger.info(f"Fetching Wirgilio data for CF: {codice_fiscale}")
+            
+            for attempt in range(settings.MAX_RETRIES):
+                try:
+                    response = await self.client.get(url, params=params)
+                    
+                    if response.status_code == 200:
+                        raw_data = response.json()
+                        logger.info(f"Retrieved {len(raw_data)} laboratory reports for {codice_fiscale}")
                         
-                        if response.status_code == 200:
-                            raw_data = response.json()
-                            logger.info(f"Retrieved {len(raw_data)} laboratory reports for {codice_fiscale}")
-                            
-                            # APPLY FILTERING HERE
-                            if filtering_service:
-                                allowed_codes = await filtering_service.get_allowed_codoffering_codes(cronoscita_id)
-                                filtered_data = filtering_service.filter_wirgilio_data(raw_data, allowed_codes)
-                                logger.info(f"🔍 Filtered to {len(filtered_data)} reports with mapped exams")
-                                return filtered_data
-                            else:
-                                logger.warning("⚠️ No filtering applied - showing all exams")
-                                return raw_data
-                                
-                        elif response.status_code == 404:
-                            logger.warning(f"No data found for CF: {codice_fiscale}")
-                            return []
+                        # APPLY FILTERING HERE
+                        if filtering_service:
+                            allowed_codes = await filtering_service.get_allowed_codoffering_codes(cronoscita_id)
+                            filtered_data = filtering_service.filter_wirgilio_data(raw_data, allowed_codes)
+                            logger.info(f"🔍 Filtered to {len(filtered_data)} reports with mapped exams")
+                            return filtered_data
                         else:
-                            logger.warning(f"Wirgilio API returned {response.status_code} (attempt {attempt + 1})")
-                            if attempt == settings.MAX_RETRIES - 1:
-                                raise WirgilioAPIException(f"API error: {response.status_code}")
-                    
-                    except httpx.TimeoutException:
-                        logger.warning(f"Timeout on attempt {attempt + 1}")
-                        if attempt == settings.MAX_RETRIES - 1:
-                            raise WirgilioAPIException("API timeout after retries")
-                    
-                    except Exception as e:
-                        logger.error(f"Request error on attempt {attempt + 1}: {e}")
+                            logger.warning("⚠️ No filtering applied - showing all exams")
+                            return raw_data
+                            
+                    elif response.status_code == 404:
+                        logger.warning(f"No data found for CF: {codice_fiscale}")
+                        return []
+                    else:
+                        logger.warning(f"Wirgilio API returned {response.status_code} (attempt {attempt + 1})")
                         if attempt == settings.MAX_RETRIES - 1:
-                            raise WirgilioAPIException(f"Request failed: {str(e)}")
+                            raise WirgilioAPIException(f"API error: {response.status_code}")
+                
+                except httpx.TimeoutException:
+                    logger.warning(f"Timeout on attempt {attempt + 1}")
+                    if attempt == settings.MAX_RETRIES - 1:
+                        raise WirgilioAPIException("API timeout after retries")
+                
+                except Exception as e:
+                    logger.error(f"Request error on attempt {attempt + 1}: {e}")
+                    if attempt == settings.MAX_RETRIES - 1:
+                        raise WirgilioAPIException(f"Request failed: {str(e)}")
+                
+                # Wait before retry
+                if attempt < settings.MAX_RETRIES - 1:
+                    await asyncio.sleep(settings.RETRY_DELAY_SECONDS)
                     
-                    # Wait before retry
-                    if attempt < settings.MAX_RETRIES - 1:
-                        await asyncio.sleep(settings.RETRY_DELAY_SECONDS)
-                        
         except WirgilioAPIException:
             raise
         except Exception as e: